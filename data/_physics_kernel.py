@@ -0,0 +1,87 @@
+"""
+Compiled per-sample physics kernel for synthetic dataset generation.
+
+When numba is installed, the physics behind RocketEngineDataGenerator is
+compiled into a parallel loop over samples. Without numba the module still
+imports, and NUMBA_AVAILABLE tells callers to use the NumPy path instead.
+"""
+
+import math
+
+from utils.rocket_physics import R_UNIVERSAL
+
+# Import numba conditionally (optional dependency)
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+        return lambda func: func
+
+    prange = range
+
+
+@njit(parallel=True, fastmath=True, error_model='numpy', cache=True)
+def compute_outputs(mixture_ratio, chamber_pressure, chamber_temperature,
+                    throat_diameter, exit_diameter, fuel_flow_rate, ambient_pressure,
+                    gamma, molecular_weight, out_pressure, out_velocity, out_thrust):
+    """
+    Compute chamber pressure, exit velocity and thrust for every sample.
+
+    Mirrors the scalar formulas in utils.rocket_physics, written as a plain
+    loop so numba can parallelize and vectorize it.
+
+    Args:
+        mixture_ratio: Oxidizer to fuel ratio per sample
+        chamber_pressure: Chamber pressure per sample [Pa]
+        chamber_temperature: Chamber temperature per sample [K]
+        throat_diameter: Throat diameter per sample [m]
+        exit_diameter: Exit diameter per sample [m]
+        fuel_flow_rate: Fuel flow rate per sample [kg/s]
+        ambient_pressure: Ambient pressure per sample [Pa]
+        gamma: Specific heat ratio per sample
+        molecular_weight: Molecular weight per sample [kg/mol]
+        out_pressure: Output array for chamber pressure [Pa]
+        out_velocity: Output array for exit velocity [m/s]
+        out_thrust: Output array for thrust [N]
+    """
+    for i in prange(mixture_ratio.shape[0]):
+        g = gamma[i]
+
+        # Calculate areas
+        throat_area = math.pi * (throat_diameter[i] / 2)**2
+        exit_area = math.pi * (exit_diameter[i] / 2)**2
+        expansion_ratio = exit_area / throat_area
+
+        # Exit Mach number: fixed-iteration Newton solve of ln(A/A*) = ln(eps)
+        M = 1.0
+        if expansion_ratio > 1.0:
+            half_gm1 = (g - 1) / 2
+            exponent = (g + 1) / (2 * (g - 1))
+            log_eps = math.log(expansion_ratio)
+            M = 2.0
+            for _ in range(25):
+                stagnation = 1 + half_gm1 * M * M
+                f = exponent * math.log(stagnation / (1 + half_gm1)) - math.log(M) - log_eps
+                fp = (M * M - 1) / (M * stagnation)
+                M = max(M - f / fp, 1.0 + 1e-6)
+
+        # Exit velocity
+        R = R_UNIVERSAL / molecular_weight[i]
+        T_ratio = 1 / (1 + (g - 1) / 2 * M * M)
+        exit_velocity = M * math.sqrt(g * R * chamber_temperature[i] * T_ratio)
+
+        # Exit pressure
+        exit_pressure = chamber_pressure[i] * (1 + (g - 1) / 2 * M * M)**(-g / (g - 1))
+
+        # Thrust
+        total_flow = fuel_flow_rate[i] * (1 + mixture_ratio[i])
+        thrust = total_flow * exit_velocity + (exit_pressure - ambient_pressure[i]) * exit_area
+
+        # Steady state: chamber pressure equals its initial value
+        out_pressure[i] = chamber_pressure[i]
+        out_velocity[i] = exit_velocity
+        out_thrust[i] = thrust
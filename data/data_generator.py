@@ -10,10 +10,54 @@ from utils.rocket_physics import (
     calculate_thrust,
     calculate_exit_velocity,
     calculate_mass_flow_rate,
-    calculate_exit_mach,
+    calculate_exit_mach_vec,
     calculate_pressure_ratio,
     create_combustion_products_properties
 )
+from data._physics_kernel import NUMBA_AVAILABLE, compute_outputs
+
+# Dataset columns: model inputs followed by model outputs
+INPUT_COLUMNS = [
+    'mixture_ratio',
+    'chamber_pressure_initial',
+    'chamber_temperature',
+    'chamber_volume',
+    'throat_diameter',
+    'exit_diameter',
+    'time_step',
+    'fuel_flow_rate'
+]
+OUTPUT_COLUMNS = [
+    'chamber_pressure_output',
+    'exit_velocity',
+    'thrust'
+]
+DATASET_COLUMNS = INPUT_COLUMNS + OUTPUT_COLUMNS
+NUM_INPUTS = len(INPUT_COLUMNS)
+
+# Rows of the sampled parameter array (first NUM_INPUTS rows follow INPUT_COLUMNS)
+COL_MR = 0  # Mixture ratio
+COL_CP = 1  # Chamber pressure (initial)
+COL_CT = 2  # Chamber temperature
+COL_CV = 3  # Chamber volume
+COL_TD = 4  # Throat diameter
+COL_ED = 5  # Exit diameter
+COL_TS = 6  # Time step
+COL_FF = 7  # Fuel flow rate
+COL_AP = 8  # Ambient pressure
+NUM_PARAMETERS = 9
+
+PARAMETER_COLUMNS = {
+    'mixture_ratio': COL_MR,
+    'chamber_pressure': COL_CP,
+    'chamber_temperature': COL_CT,
+    'chamber_volume': COL_CV,
+    'throat_diameter': COL_TD,
+    'exit_diameter': COL_ED,
+    'time_step': COL_TS,
+    'fuel_flow_rate': COL_FF,
+    'ambient_pressure': COL_AP
+}
 
 
 class RocketEngineDataGenerator:
@@ -31,7 +75,7 @@ class RocketEngineDataGenerator:
         Args:
             seed: Random seed for reproducibility
         """
-        np.random.seed(seed)
+        self.rng = np.random.default_rng(seed)
         
         # Default parameter ranges
         self.parameter_ranges = {
@@ -56,156 +100,196 @@ class RocketEngineDataGenerator:
             if param in self.parameter_ranges:
                 self.parameter_ranges[param] = range_vals
                 
-    def _sample_parameters(self, num_samples):
+    def _sample_parameters(self, num_samples, fixed_geometry=False):
         """
         Sample random parameters within defined ranges.
         
         Args:
             num_samples: Number of samples to generate
+            fixed_geometry: Whether to draw a single throat/exit diameter
+                shared by all samples
             
         Returns:
-            Dictionary of parameter arrays
+            float32 array of shape (NUM_PARAMETERS, num_samples); row
+            PARAMETER_COLUMNS[name] holds the samples of one parameter
+            contiguously
         """
-        params = {}
+        params = np.empty((NUM_PARAMETERS, num_samples), dtype=np.float32)
         
         for param, (min_val, max_val) in self.parameter_ranges.items():
-            params[param] = np.random.uniform(min_val, max_val, num_samples)
+            params[PARAMETER_COLUMNS[param]] = self.rng.uniform(min_val, max_val, num_samples)
+            
+        # Collapse the nozzle geometry to one engine
+        if fixed_geometry:
+            params[COL_TD] = self.rng.uniform(*self.parameter_ranges['throat_diameter'])
+            params[COL_ED] = self.rng.uniform(*self.parameter_ranges['exit_diameter'])
             
         # Calculate time steps (0 to 5 seconds)
-        params['time_step'] = np.linspace(0, 5, num_samples)
+        params[COL_TS] = np.linspace(0, 5, num_samples)
         
         return params
     
-    def generate_dataset(self, num_samples=1000, add_noise=True, noise_level=0.02):
+    def _compute_outputs(self, params, gamma, mol_weight, fixed_geometry=False):
         """
-        Generate a synthetic dataset for rocket engine simulation.
+        Compute physics outputs for all samples with NumPy array operations.
         
         Args:
-            num_samples: Number of samples to generate
-            add_noise: Whether to add noise to the output data
-            noise_level: Level of noise to add (fraction of value)
+            params: Sampled parameter array (see _sample_parameters)
+            gamma: Specific heat ratio array
+            mol_weight: Molecular weight array [kg/mol]
+            fixed_geometry: Whether all samples share one throat/exit diameter
             
         Returns:
-            tuple: (input_data, output_data) as numpy arrays
+            tuple: (chamber_pressure, exit_velocity, thrust) arrays
         """
-        # Sample input parameters
-        params = self._sample_parameters(num_samples)
-        
-        # Create empty arrays for outputs
-        chamber_pressure = np.zeros(num_samples)
-        exit_velocity = np.zeros(num_samples)
-        thrust = np.zeros(num_samples)
-        
-        # Calculate outputs based on physics
-        for i in range(num_samples):
-            # Get parameters for this sample
-            mixture_ratio = params['mixture_ratio'][i]
-            chamber_pressure_init = params['chamber_pressure'][i]
-            chamber_temp = params['chamber_temperature'][i]
-            chamber_vol = params['chamber_volume'][i]
-            throat_diam = params['throat_diameter'][i]
-            exit_diam = params['exit_diameter'][i]
-            fuel_flow = params['fuel_flow_rate'][i]
-            ambient_p = params['ambient_pressure'][i]
+        if fixed_geometry:
+            # Geometry is shared: areas are scalars and the exit Mach solve
+            # only needs one Newton solve per distinct gamma
+            throat_area = np.pi * (float(params[COL_TD, 0])/2)**2
+            exit_area = np.pi * (float(params[COL_ED, 0])/2)**2
+            expansion_ratio = exit_area / throat_area
             
+            unique_gamma, gamma_index = np.unique(gamma, return_inverse=True)
+            exit_mach = calculate_exit_mach_vec(expansion_ratio, unique_gamma)[gamma_index]
+        else:
             # Calculate areas
-            throat_area = np.pi * (throat_diam/2)**2
-            exit_area = np.pi * (exit_diam/2)**2
+            throat_area = np.pi * (params[COL_TD]/2)**2
+            exit_area = np.pi * (params[COL_ED]/2)**2
             expansion_ratio = exit_area / throat_area
             
-            # Get combustion properties
-            comb_props = create_combustion_products_properties(mixture_ratio)
-            gamma = comb_props['gamma']
-            mol_weight = comb_props['molecular_weight']
-            
-            # Calculate mass flow rate
-            total_flow = fuel_flow * (1 + mixture_ratio)  # Total propellant flow
-            
-            # Calculate exit Mach number and velocity
-            exit_mach = calculate_exit_mach(expansion_ratio, gamma)
-            v_exit = calculate_exit_velocity(chamber_temp, exit_mach, gamma, mol_weight)
+            exit_mach = calculate_exit_mach_vec(expansion_ratio, gamma)
+        
+        # Calculate mass flow rate
+        total_flow = params[COL_FF] * (1 + params[COL_MR])  # Total propellant flow
+        
+        # Calculate exit velocity
+        exit_velocity = calculate_exit_velocity(params[COL_CT], exit_mach, gamma, mol_weight)
+        
+        # Calculate exit pressure
+        p_ratio = calculate_pressure_ratio(exit_mach, gamma)
+        exit_p = params[COL_CP] * p_ratio
+        
+        # Calculate thrust
+        thrust = calculate_thrust(
+            params[COL_CP],
+            throat_area,
+            exit_area,
+            exit_p,
+            params[COL_AP],
+            exit_velocity,
+            total_flow,
+            gamma
+        )
+        
+        # For simplicity, assume steady state for chamber pressure
+        # In a more complex model, we'd model the pressure rise
+        chamber_pressure = params[COL_CP]
+        
+        return chamber_pressure, exit_velocity, thrust
+    
+    def generate_dataset(self, num_samples=1000, add_noise=True, noise_level=0.02, fixed_geometry=False):
+        """
+        Generate a synthetic dataset for rocket engine simulation.
+        
+        Args:
+            num_samples: Number of samples to generate
+            add_noise: Whether to add noise to the output data
+            noise_level: Level of noise to add (fraction of value)
+            fixed_geometry: Sweep operating conditions for a single engine
+                geometry (one throat/exit diameter drawn for all samples)
             
-            # Calculate exit pressure
-            p_ratio = calculate_pressure_ratio(exit_mach, gamma)
-            exit_p = chamber_pressure_init * p_ratio
+        Returns:
+            tuple: (input_data, output_data) as float32 numpy arrays
+                (column views of a single dataset array)
+        """
+        data = self._generate_data(num_samples, add_noise, noise_level, fixed_geometry)
+        return data[:, :NUM_INPUTS], data[:, NUM_INPUTS:]
+    
+    def _generate_data(self, num_samples, add_noise, noise_level, fixed_geometry=False):
+        """
+        Generate the full dataset into a single preallocated array.
+        
+        Args:
+            num_samples: Number of samples to generate
+            add_noise: Whether to add noise to the output data
+            noise_level: Level of noise to add (fraction of value)
+            fixed_geometry: Whether all samples share one throat/exit diameter
             
-            # Calculate thrust
-            F = calculate_thrust(
-                chamber_pressure_init, 
-                throat_area, 
-                exit_area, 
-                exit_p, 
-                ambient_p, 
-                v_exit, 
-                total_flow,
-                gamma
+        Returns:
+            float32 array of shape (num_samples, len(DATASET_COLUMNS))
+        """
+        # Sample input parameters
+        params = self._sample_parameters(num_samples, fixed_geometry)
+        
+        # Get combustion properties
+        comb_props = create_combustion_products_properties(params[COL_MR])
+        gamma = comb_props['gamma']
+        mol_weight = comb_props['molecular_weight']
+        
+        # Fill one dataset array in place: inputs, then outputs
+        data = np.empty((num_samples, len(DATASET_COLUMNS)), dtype=np.float32)
+        data[:, :NUM_INPUTS] = params[:NUM_INPUTS].T
+        outputs = data[:, NUM_INPUTS:]
+        
+        if NUMBA_AVAILABLE and not fixed_geometry:
+            # Compiled parallel loop over samples, writing straight into the output columns
+            compute_outputs(
+                params[COL_MR],
+                params[COL_CP],
+                params[COL_CT],
+                params[COL_TD],
+                params[COL_ED],
+                params[COL_FF],
+                params[COL_AP],
+                gamma,
+                mol_weight,
+                outputs[:, 0],
+                outputs[:, 1],
+                outputs[:, 2]
+            )
+        else:
+            outputs[:, 0], outputs[:, 1], outputs[:, 2] = self._compute_outputs(
+                params, gamma, mol_weight, fixed_geometry
             )
-            
-            # For simplicity, assume steady state for chamber pressure
-            # In a more complex model, we'd model the pressure rise
-            chamber_pressure[i] = chamber_pressure_init
-            exit_velocity[i] = v_exit
-            thrust[i] = F
         
-        # Add noise if requested
+        # Add noise if requested: one draw for all output columns, scaled per column mean
         if add_noise:
-            chamber_pressure += np.random.normal(0, noise_level * np.mean(chamber_pressure), num_samples)
-            exit_velocity += np.random.normal(0, noise_level * np.mean(exit_velocity), num_samples)
-            thrust += np.random.normal(0, noise_level * np.mean(thrust), num_samples)
-        
-        # Create input array
-        inputs = np.column_stack([
-            params['mixture_ratio'],
-            params['chamber_pressure'],
-            params['chamber_temperature'],
-            params['chamber_volume'],
-            params['throat_diameter'],
-            params['exit_diameter'],
-            params['time_step'],
-            params['fuel_flow_rate']
-        ])
-        
-        # Create output array
-        outputs = np.column_stack([
-            chamber_pressure,
-            exit_velocity,
-            thrust
-        ])
+            means = outputs.mean(axis=0, dtype=np.float64)
+            noise = self.rng.standard_normal((num_samples, len(OUTPUT_COLUMNS)), dtype=np.float32)
+            noise *= (noise_level * means).astype(np.float32)
+            outputs += noise
         
-        return inputs, outputs
+        return data
     
-    def save_dataset(self, filename, num_samples=1000, add_noise=True, noise_level=0.02):
+    def save_dataset(self, filename, num_samples=1000, add_noise=True, noise_level=0.02, file_format=None,
+                     fixed_geometry=False):
         """
-        Generate and save dataset to CSV file.
+        Generate and save dataset to a CSV, Parquet or Feather file.
         
         Args:
             filename: Output filename
             num_samples: Number of samples to generate
             add_noise: Whether to add noise to output data
             noise_level: Level of noise to add
+            file_format: 'csv', 'parquet' or 'feather'; inferred from the
+                filename extension when None (defaults to CSV)
+            fixed_geometry: Whether all samples share one throat/exit diameter
         """
-        inputs, outputs = self.generate_dataset(num_samples, add_noise, noise_level)
-        
-        # Combine into a single DataFrame
-        columns = [
-            'mixture_ratio',
-            'chamber_pressure_initial',
-            'chamber_temperature',
-            'chamber_volume',
-            'throat_diameter',
-            'exit_diameter',
-            'time_step',
-            'fuel_flow_rate',
-            'chamber_pressure_output',
-            'exit_velocity',
-            'thrust'
-        ]
-        
-        data = np.hstack([inputs, outputs])
-        df = pd.DataFrame(data, columns=columns)
-        
-        # Save to CSV
-        df.to_csv(filename, index=False)
+        data = self._generate_data(num_samples, add_noise, noise_level, fixed_geometry)
+        
+        # Wrap the dataset array in a DataFrame without copying
+        df = pd.DataFrame(data, columns=DATASET_COLUMNS, copy=False)
+        
+        if file_format is None:
+            file_format = os.path.splitext(filename)[1].lstrip('.').lower() or 'csv'
+        
+        # Binary columnar formats (require pyarrow) are far smaller and faster than CSV
+        if file_format == 'parquet':
+            df.to_parquet(filename, engine='pyarrow', compression='zstd', index=False)
+        elif file_format == 'feather':
+            df.to_feather(filename)
+        else:
+            df.to_csv(filename, index=False)
         
         print(f"Dataset saved to {filename}")
         
@@ -215,7 +299,7 @@ class RocketEngineDataGenerator:
 # Example usage
 if __name__ == "__main__":
     generator = RocketEngineDataGenerator()
-    df = generator.save_dataset("rocket_engine_data.csv", num_samples=1000)
+    df = generator.save_dataset("rocket_engine_data.parquet", num_samples=1000)
     
     # Print some statistics
     print("\nDataset Statistics:")
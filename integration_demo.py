@@ -15,10 +15,10 @@ connecting to actual hardware.
 import os
 import sys
 import time
+import multiprocessing
 import numpy as np
-import matplotlib.pyplot as plt
-import pandas as pd
 import torch
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 # Add project root to path
@@ -28,11 +28,60 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from models.pinn_model import RocketEnginePINN
 from utils.pid_controller import PIDController, PINNGuidedPIDController
 from utils.hardware_interface import get_hardware_interface
-from utils.rocket_physics import (
-    calculate_thrust,
-    calculate_exit_velocity,
-    calculate_mass_flow_rate
-)
+
+# Propellant flow at full valve opening [kg/s] (matches the virtual hardware)
+FUEL_VALVE_MAX_FLOW = 0.3
+OXIDIZER_VALVE_MAX_FLOW = 0.7
+
+# Columns of the control-loop time history buffer
+HISTORY_COLUMNS = [
+    'Time',
+    'Thrust',
+    'Chamber Pressure',
+    'Fuel Flow Rate',
+    'Oxidizer Flow Rate',
+    'Mixture Ratio',
+    'Setpoint',
+    'Control Output'
+]
+(COL_TIME, COL_THRUST, COL_PRESSURE, COL_FUEL_FLOW, COL_OXIDIZER_FLOW,
+ COL_MIXTURE_RATIO, COL_SETPOINT, COL_CONTROL_OUTPUT) = range(len(HISTORY_COLUMNS))
+
+
+def fixed_rate_iter(rate_hz, num_ticks):
+    """
+    Yield loop ticks at a fixed rate against absolute monotonic deadlines.
+    
+    Uses a periodic timerfd where the platform provides one (Linux, Python
+    3.13+) for kernel-side sub-millisecond pacing, otherwise sleeps until
+    each absolute deadline. Either way the schedule does not drift.
+    
+    Args:
+        rate_hz: Tick rate (Hz)
+        num_ticks: Number of ticks to yield
+        
+    Yields:
+        Tuple (tick_index, elapsed_time) with elapsed time in seconds since the first tick
+    """
+    interval_ns = int(1e9 / rate_hz)
+    start_ns = time.monotonic_ns()
+    
+    if hasattr(os, 'timerfd_create'):
+        fd = os.timerfd_create(time.CLOCK_MONOTONIC)
+        try:
+            os.timerfd_settime_ns(fd, initial=interval_ns, interval=interval_ns)
+            for i in range(num_ticks):
+                if i > 0:
+                    os.read(fd, 8)  # Blocks until the next expiration
+                yield i, (time.monotonic_ns() - start_ns) / 1e9
+        finally:
+            os.close(fd)
+    else:
+        for i in range(num_ticks):
+            remaining_ns = start_ns + i * interval_ns - time.monotonic_ns()
+            if remaining_ns > 0:
+                time.sleep(remaining_ns / 1e9)
+            yield i, (time.monotonic_ns() - start_ns) / 1e9
 
 
 def load_pinn_model(model_path="models/rocket_engine_pinn.pt"):
@@ -43,18 +92,24 @@ def load_pinn_model(model_path="models/rocket_engine_pinn.pt"):
         model_path: Path to the saved model
         
     Returns:
-        Loaded PINN model or None if loading fails
+        Loaded (traced) PINN model or None if loading fails
     """
     try:
         model = RocketEnginePINN()
         
-        if os.path.exists(model_path):
-            model.load_state_dict(torch.load(model_path))
-            model.eval()
+        try:
+            # Memory-map tensors straight from the file; weights only, no arbitrary pickles
+            state_dict = torch.load(model_path, mmap=True, weights_only=True, map_location='cpu')
+            model.load_state_dict(state_dict)
             print(f"Loaded model from {model_path}")
-        else:
+        except FileNotFoundError:
             print(f"Model file not found at {model_path}")
             print("Using untrained model (not recommended)")
+        
+        # Trace once for low-overhead single-state inference in the control loop
+        model.eval()
+        with torch.no_grad():
+            model = torch.jit.trace(model, torch.zeros(1, 8))
             
         return model
     except Exception as e:
@@ -120,21 +175,14 @@ def run_control_loop(hardware, controller, duration=30.0, update_rate=10.0,
     hardware.start()
     
     # Initialize data storage
-    update_interval = 1.0 / update_rate
     num_samples = int(duration * update_rate)
     
-    time_points = np.zeros(num_samples)
-    thrust_data = np.zeros(num_samples)
-    pressure_data = np.zeros(num_samples)
-    fuel_flow_data = np.zeros(num_samples)
-    oxidizer_flow_data = np.zeros(num_samples)
-    setpoint_data = np.zeros(num_samples)
-    control_output_data = np.zeros(num_samples)
+    history = np.zeros((num_samples, len(HISTORY_COLUMNS)))
     
     # Set initial mixture ratio by setting oxidizer valve
     initial_fuel_flow = 0.1  # Initial fuel flow [kg/s]
-    hardware.set_actuator('fuel_valve', initial_fuel_flow / 0.3)  # Scale to valve position
-    hardware.set_actuator('oxidizer_valve', (initial_fuel_flow * target_mixture_ratio) / 0.7)
+    hardware.set_actuator('fuel_valve', initial_fuel_flow / FUEL_VALVE_MAX_FLOW)  # Scale to valve position
+    hardware.set_actuator('oxidizer_valve', (initial_fuel_flow * target_mixture_ratio) / OXIDIZER_VALVE_MAX_FLOW)
     
     # Create state array for PINN input
     if use_pinn_predictions and isinstance(controller, PINNGuidedPIDController):
@@ -152,24 +200,28 @@ def run_control_loop(hardware, controller, duration=30.0, update_rate=10.0,
     print("Starting control loop...")
     print(f"Target thrust: {controller.setpoint} N")
     
-    # Record start time
-    start_time = time.time()
+    # Loop-invariant valve scaling (flow command -> valve position)
+    inv_fuel_scale = 1.0 / FUEL_VALVE_MAX_FLOW
+    oxidizer_scale = target_mixture_ratio / OXIDIZER_VALVE_MAX_FLOW
     
-    # Run control loop
-    for i in range(num_samples):
-        loop_start = time.time()
-        current_time = loop_start - start_time
-        
+    # Sensor indices, looked up once instead of by name every tick
+    thrust_idx = hardware.sensor_index('thrust')
+    chamber_pressure_idx = hardware.sensor_index('chamber_pressure')
+    fuel_flow_idx = hardware.sensor_index('fuel_flow_rate')
+    oxidizer_flow_idx = hardware.sensor_index('oxidizer_flow_rate')
+    
+    # Run control loop at a fixed rate
+    for i, current_time in fixed_rate_iter(update_rate, num_samples):
         # Ignite engine after delay
         if current_time >= ignition_delay and not hardware.is_ignited():
             print(f"Igniting engine at t={current_time:.1f}s...")
             hardware.set_actuator('igniter', 1.0)
         
         # Read current sensor values
-        thrust = hardware.read_sensor('thrust')
-        chamber_pressure = hardware.read_sensor('chamber_pressure')
-        fuel_flow = hardware.read_sensor('fuel_flow_rate')
-        oxidizer_flow = hardware.read_sensor('oxidizer_flow_rate')
+        thrust = hardware.read_sensor_by_index(thrust_idx)
+        chamber_pressure = hardware.read_sensor_by_index(chamber_pressure_idx)
+        fuel_flow = hardware.read_sensor_by_index(fuel_flow_idx)
+        oxidizer_flow = hardware.read_sensor_by_index(oxidizer_flow_idx)
         
         # Update state array for PINN
         if use_pinn_predictions and isinstance(controller, PINNGuidedPIDController):
@@ -189,30 +241,24 @@ def run_control_loop(hardware, controller, duration=30.0, update_rate=10.0,
             control_output = controller.update(thrust, current_time)
         
         # Apply control output to fuel valve
-        hardware.set_actuator('fuel_valve', control_output / 0.3)  # Scale to valve position
+        hardware.set_actuator('fuel_valve', control_output * inv_fuel_scale)  # Scale to valve position
         
         # Adjust oxidizer to maintain mixture ratio
-        oxidizer_target = control_output * target_mixture_ratio
-        hardware.set_actuator('oxidizer_valve', oxidizer_target / 0.7)  # Scale to valve position
+        hardware.set_actuator('oxidizer_valve', control_output * oxidizer_scale)  # Scale to valve position
         
         # Store data
-        time_points[i] = current_time
-        thrust_data[i] = thrust
-        pressure_data[i] = chamber_pressure
-        fuel_flow_data[i] = fuel_flow
-        oxidizer_flow_data[i] = oxidizer_flow
-        setpoint_data[i] = controller.setpoint
-        control_output_data[i] = control_output
+        row = history[i]
+        row[COL_TIME] = current_time
+        row[COL_THRUST] = thrust
+        row[COL_PRESSURE] = chamber_pressure
+        row[COL_FUEL_FLOW] = fuel_flow
+        row[COL_OXIDIZER_FLOW] = oxidizer_flow
+        row[COL_CONTROL_OUTPUT] = control_output
         
         # Print status every second
         if i % int(update_rate) == 0:
             print(f"t={current_time:.1f}s | Thrust={thrust:.1f}N | Pressure={chamber_pressure/1e6:.2f}MPa | "
                  f"Fuel Flow={fuel_flow*1000:.1f}g/s | O/F Ratio={oxidizer_flow/max(fuel_flow, 1e-6):.2f}")
-        
-        # Wait for next update
-        elapsed = time.time() - loop_start
-        if elapsed < update_interval:
-            time.sleep(update_interval - elapsed)
     
     # Turn off the engine
     print("Shutting down engine...")
@@ -224,21 +270,61 @@ def run_control_loop(hardware, controller, duration=30.0, update_rate=10.0,
     time.sleep(1.0)
     hardware.stop()
     
-    # Create DataFrame with time history
-    results = pd.DataFrame({
-        'Time': time_points,
-        'Thrust': thrust_data,
-        'Chamber Pressure': pressure_data,
-        'Fuel Flow Rate': fuel_flow_data,
-        'Oxidizer Flow Rate': oxidizer_flow_data,
-        'Mixture Ratio': oxidizer_flow_data / np.clip(fuel_flow_data, 1e-6, None),
-        'Setpoint': setpoint_data,
-        'Control Output': control_output_data
-    })
+    # Setpoint is constant for the whole run
+    history[:, COL_SETPOINT] = controller.setpoint
+    
+    # Fill mixture ratio column from the recorded flows
+    # (in place in the mixture column: no temporary arrays)
+    mixture_ratio = history[:, COL_MIXTURE_RATIO]
+    np.maximum(history[:, COL_FUEL_FLOW], 1e-6, out=mixture_ratio)
+    np.divide(history[:, COL_OXIDIZER_FLOW], mixture_ratio, out=mixture_ratio)
+    
+    # Wrap the time history buffer in a DataFrame without copying
+    import pandas as pd
+    results = pd.DataFrame(history, columns=HISTORY_COLUMNS, copy=False)
     
     return results
 
 
+def run_controller_trial(controller_name, target_thrust=500.0, duration=20.0, update_rate=10.0):
+    """
+    Run one controller test against a fresh virtual hardware instance.
+    
+    Everything is built inside the call so trials can run in separate
+    worker processes without sharing hardware or model state.
+    
+    Args:
+        controller_name: Controller to test ('basic' or 'pinn')
+        target_thrust: Target thrust in Newtons
+        duration: Total duration to run (seconds)
+        update_rate: Control loop update rate (Hz)
+        
+    Returns:
+        DataFrame with time history data, or None if the PINN model failed to load
+    """
+    use_pinn = controller_name == 'pinn'
+    
+    pinn_model = None
+    if use_pinn:
+        # This worker process only runs tiny batches at 10 Hz; a single intra-op
+        # thread avoids oversubscribing cores shared with the other trial
+        torch.set_num_threads(1)
+        pinn_model = load_pinn_model()
+        if pinn_model is None:
+            return None
+    
+    controllers = setup_controllers(pinn_model, target_thrust)
+    hardware = get_hardware_interface(use_virtual=True)
+    
+    return run_control_loop(
+        hardware,
+        controllers[controller_name],
+        duration=duration,
+        update_rate=update_rate,
+        use_pinn_predictions=use_pinn
+    )
+
+
 def plot_results(results, controller_name, save_plot=True, show_plot=True):
     """
     Plot the control system performance.
@@ -249,7 +335,15 @@ def plot_results(results, controller_name, save_plot=True, show_plot=True):
         save_plot: Whether to save the plot to a file
         show_plot: Whether to show the plot
     """
-    fig, axes = plt.subplots(3, 1, figsize=(12, 10), sharex=True)
+    # Plotting libraries are imported on demand to keep the control loop's import cost low
+    if show_plot:
+        import matplotlib.pyplot as plt
+        fig, axes = plt.subplots(3, 1, figsize=(12, 10), sharex=True)
+    else:
+        # Headless: build the figure without pyplot or a GUI backend
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(12, 10))
+        axes = fig.subplots(3, 1, sharex=True)
     
     # Plot 1: Thrust vs Time
     axes[0].plot(results['Time'], results['Thrust'], 'b-', label='Actual')
@@ -282,13 +376,13 @@ def plot_results(results, controller_name, save_plot=True, show_plot=True):
     axes[2].grid(True)
     axes[2].legend()
     
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Save plot if requested
     if save_plot:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"results_{controller_name}_{timestamp}.png"
-        plt.savefig(filename, dpi=150)
+        fig.savefig(filename, dpi=150)
         print(f"Plot saved to {filename}")
     
     # Show plot if requested
@@ -327,11 +421,10 @@ def compare_controllers(basic_results, pinn_results):
         target = operating_data['Setpoint'].iloc[0]
         tolerance = 0.05 * target
         
-        settled_idx = None
-        for i in range(len(operating_data) - 20):  # Need at least 20 consecutive samples
-            if all(abs(operating_data['Thrust'].iloc[i:i+20] - target) < tolerance):
-                settled_idx = i
-                break
+        # First index starting 20 consecutive in-tolerance samples
+        within = (np.abs(operating_data['Thrust'].to_numpy() - target) < tolerance).astype(np.int8)
+        settled = np.convolve(within, np.ones(20, dtype=np.int8), mode='valid')[:-1] == 20
+        settled_idx = int(np.argmax(settled)) if settled.any() else None
                 
         if settled_idx is not None:
             settling_time = operating_data['Time'].iloc[settled_idx] - operating_data['Time'].iloc[0]
@@ -365,6 +458,7 @@ def compare_controllers(basic_results, pinn_results):
         print(f"{metric:<20} {basic_val:<15.2f} {pinn_val:<15.2f} {improvement:>+15.2f}%")
     
     # Plot comparison
+    import matplotlib.pyplot as plt
     fig, axes = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
     
     # Plot 1: Thrust comparison
@@ -399,48 +493,54 @@ def compare_controllers(basic_results, pinn_results):
     plt.show()
 
 
+def save_results_csv(results, filename):
+    """
+    Write controller results to CSV.
+    
+    Uses pyarrow's C++ CSV writer when available; falls back to pandas.
+    
+    Args:
+        results (pd.DataFrame): Controller results
+        filename (str): Output CSV path
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        results.to_csv(filename, index=False)
+        return
+    
+    pacsv.write_csv(pa.Table.from_pandas(results, preserve_index=False), filename)
+
+
 def main():
     """Main function for the integration demo."""
     print("PINN-based PID Controller for Liquid Rocket Engine - Integration Demo")
     print("-------------------------------------------------------------------")
     
-    # Load the PINN model
-    pinn_model = load_pinn_model()
-    if pinn_model is None:
-        print("Failed to load PINN model. Exiting.")
-        return
-    
-    # Set up controllers
     target_thrust = 500.0  # Target thrust in Newtons
-    controllers = setup_controllers(pinn_model, target_thrust)
     
-    # Get virtual hardware interface
-    hardware = get_hardware_interface(use_virtual=True)
+    # Check the PINN model loads before starting either trial, so a bad model
+    # file fails fast instead of after the basic PID run has completed
+    if load_pinn_model() is None:
+        print("Failed to load PINN model. Exiting.")
+        return
     
-    # Run basic PID controller
-    print("\nRunning test with basic PID controller...")
-    basic_results = run_control_loop(
-        hardware, 
-        controllers['basic'], 
-        duration=20.0, 
-        update_rate=10.0,
-        use_pinn_predictions=False
-    )
+    # Run both controllers at once, each against its own virtual hardware.
+    # Use spawn so each worker starts with a fresh torch runtime.
+    print("\nRunning tests with basic PID and PINN-guided PID controllers in parallel...")
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn')) as executor:
+        basic_future = executor.submit(run_controller_trial, 'basic', target_thrust)
+        pinn_future = executor.submit(run_controller_trial, 'pinn', target_thrust)
+        basic_results = basic_future.result()
+        pinn_results = pinn_future.result()
+    
+    if pinn_results is None:
+        print("Failed to load PINN model in the trial worker. Exiting.")
+        return
     
     # Plot results
     plot_results(basic_results, "Basic PID", save_plot=True, show_plot=False)
-    
-    # Run PINN-guided PID controller
-    print("\nRunning test with PINN-guided PID controller...")
-    pinn_results = run_control_loop(
-        hardware, 
-        controllers['pinn'], 
-        duration=20.0, 
-        update_rate=10.0,
-        use_pinn_predictions=True
-    )
-    
-    # Plot results
     plot_results(pinn_results, "PINN-guided PID", save_plot=True, show_plot=False)
     
     # Compare controllers
@@ -448,8 +548,8 @@ def main():
     
     # Save results to CSV
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    basic_results.to_csv(f"basic_pid_results_{timestamp}.csv", index=False)
-    pinn_results.to_csv(f"pinn_pid_results_{timestamp}.csv", index=False)
+    save_results_csv(basic_results, f"basic_pid_results_{timestamp}.csv")
+    save_results_csv(pinn_results, f"pinn_pid_results_{timestamp}.csv")
     
     print("Demo completed successfully.")
 
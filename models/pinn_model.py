@@ -1,6 +1,14 @@
+import math
+
 import torch
 import torch.nn as nn
-import numpy as np
+from torch.utils.checkpoint import checkpoint
+from torch.utils.data import DataLoader, TensorDataset
+
+# Physics constants (these would be more precise in a real implementation)
+R = 8.314  # Universal gas constant [J/(mol·K)]
+GAMMA = 1.4  # Specific heat ratio (approximation)
+M = 0.028  # Molar mass [kg/mol] (approximation for combustion products)
 
 class RocketEnginePINN(nn.Module):
     """
@@ -10,7 +18,8 @@ class RocketEnginePINN(nn.Module):
     while incorporating physics constraints in the loss function.
     """
     
-    def __init__(self, input_dim=8, hidden_dim=50, output_dim=3, num_layers=5):
+    def __init__(self, input_dim=8, hidden_dim=50, output_dim=3, num_layers=5, activation=nn.Tanh,
+                 hard_constraint_pressure=False):
         """
         Initialize the PINN model.
         
@@ -30,23 +39,39 @@ class RocketEnginePINN(nn.Module):
                 - exit velocity
                 - thrust
             num_layers (int): Number of hidden layers
+            activation (type): Activation module class for the hidden layers.
+                nn.Tanh matches the shipped checkpoints; nn.SiLU is cheaper
+                elementwise and still smooth for the physics residuals
+            hard_constraint_pressure (bool): Tie the chamber pressure output to
+                the initial chamber pressure input (steady state) instead of
+                learning it through a physics-loss penalty
         """
         super(RocketEnginePINN, self).__init__()
         
-        # Input normalization parameters (to be set during training)
-        self.input_mean = None
-        self.input_std = None
+        # Input normalization parameters (identity until set during training).
+        # Buffers follow .to(device) and are saved in the state dict.
+        self.register_buffer('input_mean', torch.zeros(input_dim))
+        self.register_buffer('input_std', torch.ones(input_dim))
+        self.register_buffer('input_inv_std', torch.ones(input_dim))
         
-        # Build neural network architecture
-        layers = [nn.Linear(input_dim, hidden_dim), nn.Tanh()]
+        # Stored so forward can enable gradient checkpointing for deep networks
+        self.num_layers = num_layers
         
-        for _ in range(num_layers - 1):
-            layers.append(nn.Linear(hidden_dim, hidden_dim))
-            layers.append(nn.Tanh())
-            
-        layers.append(nn.Linear(hidden_dim, output_dim))
+        # Steady-state pressure as an output reparametrization rather than a loss term
+        self.hard_constraint_pressure = hard_constraint_pressure
+        
+        # Build neural network architecture: explicit Linear layers applied in a
+        # loop in forward, so each Linear + activation pair is visible for fusion
+        self.hidden = nn.ModuleList(
+            [nn.Linear(input_dim, hidden_dim)] +
+            [nn.Linear(hidden_dim, hidden_dim) for _ in range(num_layers - 1)]
+        )
+        self.activation = activation()
+        self.out = nn.Linear(hidden_dim, output_dim)
         
-        self.network = nn.Sequential(*layers)
+        # Constant physics scalars used by physics_loss (computed once)
+        self._pressure_ratio = (2/(GAMMA+1))**((GAMMA)/(GAMMA-1))
+        self._velocity_coeff = 2 * GAMMA * R / M * (1 - self._pressure_ratio)
         
     def forward(self, x):
         """
@@ -60,11 +85,47 @@ class RocketEnginePINN(nn.Module):
             torch.Tensor: Output tensor with shape [batch_size, output_dim]
                 Contains predicted chamber pressure, exit velocity, and thrust.
         """
-        # Normalize inputs if normalization parameters are available
-        if self.input_mean is not None and self.input_std is not None:
-            x = (x - self.input_mean) / self.input_std
+        # Raw initial chamber pressure, before normalization
+        chamber_pressure_init = x[:, 1:2]
+        
+        # Normalize inputs (branchless; the defaults are an identity transform)
+        x = (x - self.input_mean) * self.input_inv_std
+        
+        # Gradient checkpointing: ~sqrt(N) segments of ~sqrt(N) layers each,
+        # keeping only segment-boundary activations for backward
+        if self.training and self.num_layers > 8 and torch.is_grad_enabled():
+            segment_size = math.isqrt(self.num_layers)
+            for start in range(0, self.num_layers, segment_size):
+                x = checkpoint(self._hidden_segment, x, start, start + segment_size,
+                               use_reentrant=False)
+        else:
+            x = self._hidden_segment(x, 0, self.num_layers)
             
-        return self.network(x)
+        out = self.out(x)
+        
+        # Replace the predicted chamber pressure with its steady-state value.
+        # Concatenate in float32: under bf16 autocast the tied pressure would
+        # otherwise be rounded (kPa-level error at MPa pressures).
+        if self.hard_constraint_pressure:
+            out = torch.cat([chamber_pressure_init, out[:, 1:].float()], dim=1)
+            
+        return out
+    
+    def _hidden_segment(self, x, start, stop):
+        """
+        Apply hidden layers start..stop-1 (each Linear followed by the activation).
+        
+        Args:
+            x (torch.Tensor): Hidden activations entering layer `start`
+            start (int): Index of the first hidden layer to apply
+            stop (int): Index one past the last hidden layer to apply
+            
+        Returns:
+            torch.Tensor: Activations after layer `stop - 1`
+        """
+        for layer in self.hidden[start:stop]:
+            x = self.activation(layer(x))
+        return x
     
     def set_normalization_params(self, input_data):
         """
@@ -73,8 +134,41 @@ class RocketEnginePINN(nn.Module):
         Args:
             input_data (torch.Tensor): Training input data
         """
-        self.input_mean = torch.mean(input_data, dim=0)
-        self.input_std = torch.std(input_data, dim=0)
+        # Mean and variance in a single pass over the data
+        var, mean = torch.var_mean(input_data, dim=0, unbiased=False)
+        
+        # Keep the stats on the same device as the weights
+        device = next(self.parameters()).device
+        self.input_mean = mean.to(device)
+        self.input_std = (torch.sqrt(var) + 1e-8).to(device)
+        
+        # Cache the reciprocal so forward multiplies instead of divides
+        self.input_inv_std = 1.0 / self.input_std
+        
+    def _load_from_state_dict(self, state_dict, prefix, *args, **kwargs):
+        """
+        Upgrade older checkpoints to the current module layout.
+        
+        Checkpoints saved with the nn.Sequential layout store layers as
+        network.{index}; Linear layers sat at even indices with the output layer
+        last. Checkpoints saved before the stats were buffers only hold the
+        network weights; they keep the model's current (identity) normalization.
+        """
+        legacy_prefix = prefix + 'network.'
+        for key in [k for k in state_dict if k.startswith(legacy_prefix)]:
+            index, param = key[len(legacy_prefix):].split('.', 1)
+            layer = int(index) // 2
+            if layer < self.num_layers:
+                state_dict[f'{prefix}hidden.{layer}.{param}'] = state_dict.pop(key)
+            else:
+                state_dict[f'{prefix}out.{param}'] = state_dict.pop(key)
+                
+        for name in ('input_mean', 'input_std', 'input_inv_std'):
+            key = prefix + name
+            if key not in state_dict:
+                state_dict[key] = getattr(self, name)
+                
+        super()._load_from_state_dict(state_dict, prefix, *args, **kwargs)
         
     def physics_loss(self, inputs, outputs):
         """
@@ -87,51 +181,41 @@ class RocketEnginePINN(nn.Module):
         Returns:
             torch.Tensor: Physics-based loss
         """
-        # Extract inputs
-        mixture_ratio = inputs[:, 0:1]
-        chamber_pressure_init = inputs[:, 1:2]
-        chamber_temp_init = inputs[:, 2:3]
-        chamber_volume = inputs[:, 3:4]
-        throat_diameter = inputs[:, 4:5]
-        exit_diameter = inputs[:, 5:6]
-        time_step = inputs[:, 6:7]
-        fuel_flow_rate = inputs[:, 7:8]
+        # Extract inputs (one [batch] view per column)
+        (mixture_ratio, chamber_pressure_init, chamber_temp_init, chamber_volume,
+         throat_diameter, exit_diameter, time_step, fuel_flow_rate) = inputs.unbind(dim=1)
         
         # Extract outputs
-        chamber_pressure = outputs[:, 0:1]
-        exit_velocity = outputs[:, 1:2]
-        thrust = outputs[:, 2:3]
-        
-        # Constants (these would be more precise in a real implementation)
-        R = 8.314  # Universal gas constant [J/(mol·K)]
-        gamma = 1.4  # Specific heat ratio (approximation)
-        M = 0.028  # Molar mass [kg/mol] (approximation for combustion products)
-        
-        # Compute throat area and exit area
-        A_t = np.pi * (throat_diameter/2)**2
-        A_e = np.pi * (exit_diameter/2)**2
+        chamber_pressure, exit_velocity, thrust = outputs.unbind(dim=1)
         
         # Physics constraint 1: Thrust equation
         # F = ṁ * v_e + (p_e - p_a) * A_e
         # For simplicity, assuming p_e = p_a (perfectly expanded)
         total_flow_rate = fuel_flow_rate * (1 + mixture_ratio)
         thrust_computed = total_flow_rate * exit_velocity
-        thrust_loss = torch.mean((thrust - thrust_computed)**2)
         
         # Physics constraint 2: Pressure-velocity relationship from Bernoulli
         # Use simplified isentropic flow relations
-        pressure_ratio = (2/(gamma+1))**((gamma)/(gamma-1))
-        exit_velocity_computed = torch.sqrt(2 * gamma * R * chamber_temp_init / M * (1 - pressure_ratio))
-        velocity_loss = torch.mean((exit_velocity - exit_velocity_computed)**2)
+        # v_e = sqrt(2*gamma*R*T/M * (1 - p_ratio)), constant factor precomputed
+        exit_velocity_computed = torch.sqrt(chamber_temp_init * self._velocity_coeff)
         
         # Physics constraint 3: Mass conservation
         # Rate of pressure change based on mass flow and chamber volume
         # dp/dt = (R*T/V)*(ṁ_in - ṁ_out)
         # For steady state: chamber_pressure ≈ chamber_pressure_init
-        pressure_loss = torch.mean((chamber_pressure - chamber_pressure_init)**2)
         
-        # Combine all physics-based losses
-        return thrust_loss + velocity_loss + pressure_loss
+        # Stack the residuals into one [batch, k] tensor so the squares and
+        # means run as a single reduction instead of k
+        terms = [thrust - thrust_computed, exit_velocity - exit_velocity_computed]
+        
+        # With the hard constraint the pressure residual is identically zero
+        if not self.hard_constraint_pressure:
+            terms.append(chamber_pressure - chamber_pressure_init)
+            
+        residuals = torch.stack(terms, dim=1)
+        
+        # Combine all physics-based losses (sum of the per-constraint MSEs)
+        return residuals.pow(2).mean(dim=0).sum()
     
     def data_loss(self, outputs, targets):
         """
@@ -168,7 +252,26 @@ class RocketEnginePINN(nn.Module):
             return physics_loss
 
 
-def train_pinn(model, inputs, targets=None, num_epochs=1000, learning_rate=0.001, physics_weight=0.5):
+def quantize_for_inference(model):
+    """
+    Quantize the PINN's Linear layers to int8 for CPU inference.
+    
+    Weights are stored as int8 and activations are quantized dynamically per
+    batch; the activation function and normalization stay in float32. The
+    returned model is for inference only (it cannot be trained further).
+    
+    Args:
+        model (RocketEnginePINN): Trained PINN model
+        
+    Returns:
+        RocketEnginePINN: Quantized copy of the model in eval mode
+    """
+    # quantize_dynamic copies the model; only the copy is switched to eval mode
+    return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8).eval()
+
+
+def train_pinn(model, inputs, targets=None, num_epochs=1000, learning_rate=0.001, physics_weight=0.5,
+               compile_step=None, use_amp=True, batch_size=None):
     """
     Train the PINN model.
     
@@ -179,33 +282,98 @@ def train_pinn(model, inputs, targets=None, num_epochs=1000, learning_rate=0.001
         num_epochs (int): Number of training epochs
         learning_rate (float): Learning rate for optimizer
         physics_weight (float): Weight of physics loss in combined loss
+        compile_step (bool, optional): Compile the forward + loss computation with
+            torch.compile so the MLP and physics arithmetic run as fused kernels;
+            None compiles only on CUDA (on CPU compilation is slower than eager)
+        use_amp (bool): Run the network forward under bfloat16 autocast when
+            training on CUDA (the physics loss is still evaluated in float32)
+        batch_size (int, optional): Mini-batch size; None trains on the full
+            dataset every epoch
         
     Returns:
-        list: Training losses
+        list: Training losses (mean over mini-batches for each epoch)
     """
-    optimizer = torch.optim.Adam(model.parameters(), lr=learning_rate)
+    # Fused single-kernel Adam on CUDA; multi-tensor (foreach) update elsewhere
+    if next(model.parameters()).is_cuda:
+        optimizer = torch.optim.Adam(model.parameters(), lr=learning_rate, fused=True)
+    else:
+        optimizer = torch.optim.Adam(model.parameters(), lr=learning_rate, foreach=True)
     
-    # Set normalization parameters
+    # Set normalization parameters (always over the full dataset)
     model.set_normalization_params(inputs)
     
-    losses = []
+    device = next(model.parameters()).device
     
-    for epoch in range(num_epochs):
-        optimizer.zero_grad()
-        
+    # bfloat16 needs no GradScaler; only worthwhile on Tensor-Core GPUs
+    amp_enabled = use_amp and device.type == 'cuda'
+    
+    def loss_step(inputs, targets):
         # Forward pass
-        outputs = model(inputs)
+        with torch.autocast(device_type=inputs.device.type, dtype=torch.bfloat16, enabled=amp_enabled):
+            outputs = model(inputs)
         
-        # Compute loss
-        loss = model.combined_loss(inputs, outputs, targets, physics_weight)
+        # Compute loss in float32 (sqrt and products in the residuals lose precision in bf16)
+        return model.combined_loss(inputs, outputs.float(), targets, physics_weight)
+    
+    if batch_size is None:
+        # Full-batch training: a single "batch" holding the whole dataset
+        batches = [(inputs,) if targets is None else (inputs, targets)]
+    else:
+        # TensorDataset cannot hold None, so physics-only training batches inputs alone
+        dataset = TensorDataset(inputs) if targets is None else TensorDataset(inputs, targets)
         
-        # Backward pass and optimization
-        loss.backward()
-        optimizer.step()
+        # Pinned host memory lets batch copies to the GPU overlap with compute.
+        # Dropping the ragged last batch keeps shapes static for the compiled step.
+        batches = DataLoader(dataset, batch_size=batch_size, shuffle=True, num_workers=0,
+                             pin_memory=device.type == 'cuda' and not inputs.is_cuda,
+                             drop_last=len(dataset) > batch_size)
+    
+    # Compile once; batches keep a fixed shape across epochs so the graph is reused.
+    # backward() stays outside the compiled region (AOTAutograd compiles it as well).
+    if compile_step is None:
+        compile_step = device.type == 'cuda'
+    step_fn = loss_step
+    if compile_step and hasattr(torch, 'compile'):
+        import torch._dynamo
         
-        losses.append(loss.item())
+        compiled_step = torch.compile(loss_step, mode="reduce-overhead", fullgraph=True)
+        
+        # Compilation happens on the first call, so trigger it here on one batch and
+        # pick the step function once (e.g. no Inductor backend on this platform)
+        batch = next(iter(batches))
+        try:
+            compiled_step(batch[0].to(device), batch[1].to(device) if len(batch) > 1 else None)
+            step_fn = compiled_step
+        except torch._dynamo.exc.TorchDynamoException as e:
+            print(f"torch.compile failed ({e}); training in eager mode")
+    
+    # Keep losses on the device; .item() forces a host sync, so only print epochs pay it
+    loss_buf = torch.zeros(num_epochs, device=device)
+    
+    for epoch in range(num_epochs):
+        num_batches = 0
+        
+        for batch in batches:
+            batch_inputs = batch[0].to(device, non_blocking=True)
+            batch_targets = batch[1].to(device, non_blocking=True) if len(batch) > 1 else None
+            
+            optimizer.zero_grad(set_to_none=True)
+            
+            loss = step_fn(batch_inputs, batch_targets)
+            
+            # Backward pass and optimization
+            loss.backward()
+            optimizer.step()
+            
+            loss_buf[epoch] += loss.detach()
+            num_batches += 1
+        
+        loss_buf[epoch] /= num_batches
         
         if epoch % 100 == 0:
-            print(f"Epoch {epoch}, Loss: {loss.item():.6f}")
+            print(f"Epoch {epoch}, Loss: {loss_buf[epoch].item():.6f}")
+    
+    # Single transfer back to the host
+    losses = loss_buf.cpu().tolist()
     
-    return losses 
\ No newline at end of file
+    return losses 
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the PINN-based Rocket Engine Simulator.
+
+Each subcommand imports only what it needs, after the arguments are parsed,
+so e.g. launching the Streamlit app does not pull in torch or plotly.
+
+Usage:
+    python run.py app         # Streamlit simulator (visualization/app.py)
+    python run.py demo        # Virtual-hardware PID comparison (integration_demo.py)
+    python run.py engine3d    # Write the 3D engine visualizations to HTML
+
+Requirements:
+    - See requirements.txt for dependencies
+"""
+
+import os
+import sys
+import argparse
+import shutil
+import runpy
+
+# Directory containing this script (the project root)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Streamlit command, resolved once (falls back to running the module directly)
+_STREAMLIT_PATH = shutil.which('streamlit')
+STREAMLIT_CMD = [_STREAMLIT_PATH] if _STREAMLIT_PATH else [sys.executable, '-m', 'streamlit']
+
+
+def run_app(args):
+    """
+    Run the Streamlit application for the PINN-based rocket engine simulator.
+    
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+    """
+    # Path to the Streamlit app
+    app_path = os.path.join(SCRIPT_DIR, 'visualization', 'app.py')
+    
+    # Check if the app file exists
+    if not os.path.exists(app_path):
+        print(f"Error: Application file not found at {app_path}")
+        sys.exit(1)
+    
+    # Print information
+    print("Starting PINN-based Rocket Engine Simulator...")
+    print("Press Ctrl+C to stop the application.")
+    
+    # Server options, as the streamlit CLI would pass them for
+    # --server.headless / --browser.serverAddress / --server.port
+    flag_options = {
+        'server_headless': True,
+        'browser_serverAddress': 'localhost',
+        'server_port': args.port
+    }
+    
+    try:
+        from streamlit.web import bootstrap
+    except ImportError:
+        # No importable runtime API: replace this process with the streamlit CLI
+        sys.stdout.flush()
+        os.execv(STREAMLIT_CMD[0], STREAMLIT_CMD + [
+            'run',
+            app_path,
+            '--server.headless', 'true',
+            '--browser.serverAddress', 'localhost',
+            '--server.port', str(args.port)
+        ])
+    
+    # Start the Streamlit server in this interpreter (no second Python startup)
+    bootstrap.load_config_options(flag_options=flag_options)
+    bootstrap.run(app_path, False, [], flag_options)
+
+
+def run_module(module_name):
+    """
+    Return a subcommand handler that runs a project module as __main__.
+    
+    Args:
+        module_name (str): Dotted module name, e.g. 'visualization.engine_3d_viz'
+    
+    Returns:
+        callable: Handler taking the parsed arguments
+    """
+    def handler(args):
+        # Import is deferred until the subcommand is actually chosen
+        if SCRIPT_DIR not in sys.path:
+            sys.path.insert(0, SCRIPT_DIR)
+        runpy.run_module(module_name, run_name='__main__', alter_sys=True)
+    
+    return handler
+
+
+def main(argv=None):
+    """
+    Parse the subcommand and dispatch to its handler.
+    
+    Args:
+        argv (list, optional): Argument list (defaults to sys.argv[1:])
+    """
+    parser = argparse.ArgumentParser(description="PINN-based Rocket Engine Simulator launcher")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    app_parser = subparsers.add_parser('app', help="Run the Streamlit simulator")
+    app_parser.add_argument('--port', type=int, default=8501, help="Streamlit server port")
+    app_parser.set_defaults(handler=run_app)
+    
+    demo_parser = subparsers.add_parser('demo', help="Run the virtual-hardware PID comparison")
+    demo_parser.set_defaults(handler=run_module('integration_demo'))
+    
+    engine_parser = subparsers.add_parser('engine3d', help="Write the 3D engine visualizations to HTML")
+    engine_parser.set_defaults(handler=run_module('visualization.engine_3d_viz'))
+    
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compiled per-tick engine physics for the virtual hardware simulation.
+
+When numba is installed, the arithmetic behind one RocketEngineVirtualHardware
+tick is compiled to a single native function. Without numba the same function
+runs as plain Python, with identical results.
+"""
+
+# Import numba conditionally (optional dependency)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+        return lambda func: func
+
+# Thrust coefficient of the simplified nozzle model (typical value for a decent nozzle)
+THRUST_COEFFICIENT = 1.4
+
+
+@njit(cache=True, fastmath=True)
+def compute_engine_state(fuel_flow, oxidizer_flow, ignited, ambient_pressure,
+                         chamber_pressure_max, pressure_factor, temperature_ambient,
+                         temperature_combustion, throat_area):
+    """
+    Compute chamber pressure, chamber temperature and thrust for one tick.
+
+    Args:
+        fuel_flow: Fuel flow rate [kg/s]
+        oxidizer_flow: Oxidizer flow rate [kg/s]
+        ignited: Whether the engine is ignited
+        ambient_pressure: Ambient pressure [Pa]
+        chamber_pressure_max: Maximum chamber pressure [Pa]
+        pressure_factor: Chamber pressure per unit total flow [Pa/(kg/s)]
+        temperature_ambient: Ambient temperature [K]
+        temperature_combustion: Combustion temperature [K]
+        throat_area: Nozzle throat area [m²]
+
+    Returns:
+        Tuple of (chamber_pressure, chamber_temperature, thrust)
+    """
+    # Engine not ignited: ambient conditions and no thrust
+    if not ignited:
+        return ambient_pressure, temperature_ambient, 0.0
+
+    # Calculate mixture ratio
+    if fuel_flow > 1e-6:  # Avoid division by zero
+        mixture_ratio = oxidizer_flow / fuel_flow
+    else:
+        mixture_ratio = 0.0
+
+    # Calculate chamber pressure (simplified model), within realistic bounds
+    chamber_pressure = (fuel_flow + oxidizer_flow) * pressure_factor
+    chamber_pressure = max(ambient_pressure, min(chamber_pressure, chamber_pressure_max))
+
+    # Calculate chamber temperature (simplification)
+    if 1.5 < mixture_ratio < 4.0:
+        # Good mixture ratio range
+        temperature_factor = 0.9
+    else:
+        # Suboptimal combustion
+        temperature_factor = 0.7
+
+    chamber_temperature = temperature_combustion * temperature_factor
+
+    # Calculate thrust (simplified)
+    # F = m_dot * v_e + (p_e - p_a) * A_e
+    # Simplified to: F = CF * A_t * p_c
+    thrust = THRUST_COEFFICIENT * throat_area * chamber_pressure
+
+    return chamber_pressure, chamber_temperature, thrust
@@ -11,11 +11,19 @@ The interface simulates:
 """
 
 import time
+import math
+import struct
 import numpy as np
 import threading
-import queue
 import serial
 import logging
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils._engine_kernel import compute_engine_state
 
 # Set up logging
 logging.basicConfig(
@@ -24,13 +32,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger("HardwareInterface")
 
+# Number of standard-normal samples drawn per noise buffer refill
+NOISE_BUFFER_SIZE = 1024
+
+# Binary serial frame: sync byte, frame type, channel id, value, checksum
+# (checksum = sum of the type, channel and value bytes, modulo 256)
+SERIAL_FRAME = struct.Struct('<BBHfB')
+SERIAL_FRAME_SYNC = 0xA5
+SERIAL_FRAME_TYPES = ('SENSOR', 'ACTUATOR')
+SERIAL_CHANNELS = (
+    'chamber_pressure',
+    'chamber_temperature',
+    'fuel_flow_rate',
+    'oxidizer_flow_rate',
+    'thrust',
+    'fuel_valve',
+    'oxidizer_valve',
+    'igniter'
+)
+
+# Longest partial ASCII line kept while waiting for its newline; anything longer is
+# line noise (or a wrong baud rate) and is discarded up to the next newline
+SERIAL_MAX_LINE = 256
+
 
 class VirtualSensor:
     """
     Base class for a virtual sensor.
     """
     
-    def __init__(self, name, units, noise_level=0.02, update_rate_hz=10):
+    def __init__(self, name, units, noise_level=0.02, update_rate_hz=10, seed=None):
         """
         Initialize a virtual sensor.
         
@@ -39,33 +70,62 @@ class VirtualSensor:
             units: Units of measurement
             noise_level: Noise level as a fraction of reading
             update_rate_hz: Update rate in Hz
+            seed: Seed for the sensor's noise generator (None for random)
         """
         self.name = name
         self.units = units
         self.noise_level = noise_level
         self.update_interval = 1.0 / update_rate_hz
         self.value = 0.0
-        self.last_update = time.time()
+        self.last_update = time.monotonic()
         
-    def read(self):
+        # Standard-normal noise is drawn in blocks and consumed one sample per update;
+        # the lock makes reads from several threads safe
+        self._rng = np.random.default_rng(seed)
+        self._noise_buf = self._rng.standard_normal(NOISE_BUFFER_SIZE)
+        self._noise_idx = 0
+        self._lock = threading.Lock()
+        
+    def read(self, now=None):
         """
         Read the current sensor value.
         
+        Args:
+            now: Current time from time.monotonic() (read from the clock if None)
+        
         Returns:
             Current sensor value with added noise
         """
-        current_time = time.time()
+        current_time = time.monotonic() if now is None else now
         
         # Initialize noise
         noise = 0.0
         
         # If it's time to update, add some noise to the value
-        if current_time - self.last_update >= self.update_interval:
-            noise = np.random.normal(0, self.noise_level * abs(self.value) + 1e-6)
-            self.last_update = current_time
+        with self._lock:
+            if current_time - self.last_update >= self.update_interval:
+                noise = self._next_standard_normal() * (self.noise_level * abs(self.value) + 1e-6)
+                self.last_update = current_time
             
         # Return value with noise
-        return self.value * (1 + noise)
+        return self.value + noise
+    
+    def _next_standard_normal(self):
+        """
+        Take the next sample from the noise buffer, refilling it when exhausted.
+        
+        The caller must hold self._lock.
+        
+        Returns:
+            Standard-normal sample
+        """
+        if self._noise_idx == NOISE_BUFFER_SIZE:
+            self._rng.standard_normal(out=self._noise_buf)
+            self._noise_idx = 0
+            
+        z = float(self._noise_buf[self._noise_idx])
+        self._noise_idx += 1
+        return z
     
     def set_value(self, value):
         """
@@ -77,6 +137,122 @@ class VirtualSensor:
         self.value = value
 
 
+class VirtualSensorBank:
+    """
+    A bank of virtual sensors stored as parallel arrays.
+    
+    Behaves like a set of VirtualSensor objects sharing one update rate, but
+    values, noise levels and update times live in NumPy arrays, so setting or
+    reading every sensor in a simulation tick is a few vector operations.
+    """
+    
+    def __init__(self, sensors, update_rate_hz=10, seed=None):
+        """
+        Initialize a virtual sensor bank.
+        
+        Args:
+            sensors: Sequence of (key, name, units, noise_level) tuples
+            update_rate_hz: Update rate in Hz
+            seed: Seed for the shared noise generator (None for random)
+        """
+        self.keys = tuple(key for key, _, _, _ in sensors)
+        self.names = tuple(name for _, name, _, _ in sensors)
+        self.units = tuple(units for _, _, units, _ in sensors)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        
+        self.noise_levels = np.array([noise_level for _, _, _, noise_level in sensors])
+        self.update_interval = 1.0 / update_rate_hz
+        self.values = np.zeros(len(self.keys))
+        self.last_update = np.full(len(self.keys), time.monotonic())
+        
+        # Standard-normal noise is drawn in blocks and consumed as reads need it.
+        # The simulation thread and external readers share the bank, so noise
+        # draws and update times are guarded by a lock.
+        self._rng = np.random.default_rng(seed)
+        self._noise_buf = self._rng.standard_normal(NOISE_BUFFER_SIZE)
+        self._noise_idx = 0
+        self._lock = threading.Lock()
+        
+    def set_values(self, values):
+        """
+        Set the underlying true values of all sensors.
+        
+        Args:
+            values: Sequence of values in key order, or a scalar for all sensors
+        """
+        self.values[:] = values
+        
+    def read(self, index, now=None):
+        """
+        Read a single sensor.
+        
+        Args:
+            index: Sensor index (see self.index)
+            now: Current time from time.monotonic() (read from the clock if None)
+            
+        Returns:
+            Current sensor value with added noise
+        """
+        current_time = time.monotonic() if now is None else now
+        value = self.values[index]
+        
+        # Initialize noise
+        noise = 0.0
+        
+        # If it's time to update, add some noise to the value
+        with self._lock:
+            if current_time - self.last_update[index] >= self.update_interval:
+                noise = self._standard_normal(1)[0] * (self.noise_levels[index] * abs(value) + 1e-6)
+                self.last_update[index] = current_time
+            
+        # Return value with noise
+        return value + noise
+        
+    def read_all(self, now=None):
+        """
+        Read all sensors at once.
+        
+        Args:
+            now: Current time from time.monotonic() (read from the clock if None)
+        
+        Returns:
+            Array of current sensor values with added noise, in key order
+        """
+        current_time = time.monotonic() if now is None else now
+        
+        values = self.values.copy()
+        
+        with self._lock:
+            # Noise standard deviation per sensor; only sensors due for an update get noise
+            due = current_time - self.last_update >= self.update_interval
+            noise_scale = np.where(due, self.noise_levels * np.abs(values) + 1e-6, 0.0)
+            self.last_update[due] = current_time
+            z = self._standard_normal(len(self.keys))
+        
+        # Return values with additive noise
+        return values + z * noise_scale
+        
+    def _standard_normal(self, count):
+        """
+        Take the next samples from the noise buffer, refilling it when exhausted.
+        
+        The caller must hold self._lock.
+        
+        Args:
+            count: Number of samples
+            
+        Returns:
+            Array of standard-normal samples (a copy, safe across refills)
+        """
+        if self._noise_idx + count > NOISE_BUFFER_SIZE:
+            self._rng.standard_normal(out=self._noise_buf)
+            self._noise_idx = 0
+            
+        z = self._noise_buf[self._noise_idx:self._noise_idx + count].copy()
+        self._noise_idx += count
+        return z
+
+
 class VirtualActuator:
     """
     Base class for a virtual actuator.
@@ -97,9 +273,12 @@ class VirtualActuator:
         self.max_value = max_value
         self.response_time = response_time
         
+        # Full-range travel per second (used when response_time > 0)
+        self._rate = (max_value - min_value) / response_time if response_time > 0 else 0.0
+        
         self.current_value = 0.0
         self.target_value = 0.0
-        self.last_update = time.time()
+        self.last_update = time.monotonic()
         
     def set(self, value):
         """
@@ -108,35 +287,33 @@ class VirtualActuator:
         Args:
             value: Target value (will be clipped to min/max range)
         """
-        self.target_value = np.clip(value, self.min_value, self.max_value)
+        self.target_value = min(max(value, self.min_value), self.max_value)
         
-    def read(self):
+    def read(self, now=None):
         """
         Read the current actuator value.
         
         The actuator gradually approaches the target value based on response time.
         
+        Args:
+            now: Current time from time.monotonic() (read from the clock if None)
+        
         Returns:
             Current actuator value
         """
-        current_time = time.time()
+        current_time = time.monotonic() if now is None else now
         dt = current_time - self.last_update
         
         # Calculate how much the value should change based on response time
         if self.response_time > 0:
-            max_change = dt / self.response_time * (self.max_value - self.min_value)
-            
-            # Move toward target value
-            if self.current_value < self.target_value:
-                self.current_value = min(
-                    self.current_value + max_change, 
-                    self.target_value
-                )
-            elif self.current_value > self.target_value:
-                self.current_value = max(
-                    self.current_value - max_change, 
-                    self.target_value
-                )
+            max_change = dt * self._rate
+            
+            # Move toward target value, by at most max_change
+            delta = self.target_value - self.current_value
+            if abs(delta) <= max_change:
+                self.current_value = self.target_value
+            else:
+                self.current_value += math.copysign(max_change, delta)
         else:
             # Instant response
             self.current_value = self.target_value
@@ -145,6 +322,188 @@ class VirtualActuator:
         return self.current_value
 
 
+class VirtualActuatorBank:
+    """
+    A bank of virtual actuators stored as parallel arrays.
+    
+    Behaves like a set of VirtualActuator objects read together, but targets,
+    current values and slew rates live in NumPy arrays, so advancing every
+    actuator in a simulation tick is a few vector operations.
+    """
+    
+    def __init__(self, actuators):
+        """
+        Initialize a virtual actuator bank.
+        
+        Args:
+            actuators: Sequence of (key, name, min_value, max_value, response_time) tuples
+        """
+        self.keys = tuple(key for key, _, _, _, _ in actuators)
+        self.names = tuple(name for _, name, _, _, _ in actuators)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        
+        self.min_values = np.array([min_value for _, _, min_value, _, _ in actuators], dtype=float)
+        self.max_values = np.array([max_value for _, _, _, max_value, _ in actuators], dtype=float)
+        response_times = np.array([response_time for _, _, _, _, response_time in actuators], dtype=float)
+        
+        # Full-range travel per second; actuators with response_time <= 0 respond instantly
+        self._instant = response_times <= 0
+        self._rates = np.divide(self.max_values - self.min_values, response_times,
+                                out=np.zeros(len(self.keys)), where=~self._instant)
+        
+        self.current_values = np.zeros(len(self.keys))
+        self.target_values = np.zeros(len(self.keys))
+        self.last_update = time.monotonic()
+        
+    def set(self, index, value):
+        """
+        Set the target value of one actuator.
+        
+        Args:
+            index: Actuator index (see self.index)
+            value: Target value (will be clipped to min/max range)
+        """
+        self.target_values[index] = min(max(value, self.min_values[index]), self.max_values[index])
+        
+    def set_all(self, value):
+        """
+        Set the target value of every actuator.
+        
+        Args:
+            value: Target value (will be clipped to each min/max range)
+        """
+        np.clip(value, self.min_values, self.max_values, out=self.target_values)
+        
+    def read_all(self, now=None):
+        """
+        Read all actuators at once.
+        
+        Each actuator gradually approaches its target value based on response time.
+        
+        Args:
+            now: Current time from time.monotonic() (read from the clock if None)
+        
+        Returns:
+            Array of current actuator values, in key order
+        """
+        current_time = time.monotonic() if now is None else now
+        dt = current_time - self.last_update
+        
+        # Move toward target values, each by at most its rate * dt
+        max_change = dt * self._rates
+        delta = self.target_values - self.current_values
+        arrived = (np.abs(delta) <= max_change) | self._instant
+        self.current_values = np.where(arrived, self.target_values,
+                                       self.current_values + np.copysign(max_change, delta))
+        
+        self.last_update = current_time
+        return self.current_values
+
+
+class SPSCRing:
+    """
+    Fixed-capacity single-producer/single-consumer ring buffer.
+    
+    Hands packets from a hardware thread to one reader without taking a lock
+    per packet (unlike queue.Queue). Only the producer writes the head
+    index and only the consumer writes the tail index; each is a single int
+    store, which is atomic under the GIL.
+    """
+    
+    def __init__(self, capacity):
+        """
+        Initialize the ring buffer.
+        
+        Args:
+            capacity: Maximum number of buffered items
+        """
+        self._capacity = capacity
+        self._slots = [None] * capacity
+        self._head = 0
+        self._tail = 0
+        
+    def put(self, item):
+        """
+        Append an item (producer side).
+        
+        Args:
+            item: Item to append
+            
+        Returns:
+            True if appended, False if the buffer was full and the item dropped
+        """
+        head = self._head
+        if head - self._tail >= self._capacity:
+            return False
+            
+        self._slots[head % self._capacity] = item
+        self._head = head + 1
+        return True
+        
+    def get(self):
+        """
+        Remove and return the oldest item (consumer side).
+        
+        Returns:
+            Oldest item or None if the buffer is empty
+        """
+        tail = self._tail
+        if tail == self._head:
+            return None
+            
+        index = tail % self._capacity
+        item = self._slots[index]
+        self._slots[index] = None
+        self._tail = tail + 1
+        return item
+        
+    def drain(self, max_items=None):
+        """
+        Remove and return all buffered items in one pass (consumer side).
+        
+        Args:
+            max_items: Maximum number of items to remove (None for all)
+            
+        Returns:
+            List of items, oldest first
+        """
+        tail = self._tail
+        count = self._head - tail
+        if max_items is not None:
+            count = min(count, max_items)
+            
+        items = []
+        for position in range(tail, tail + count):
+            index = position % self._capacity
+            items.append(self._slots[index])
+            self._slots[index] = None
+            
+        self._tail = tail + count
+        return items
+        
+    def get_latest(self):
+        """
+        Return the newest item and discard all older ones (consumer side).
+        
+        Returns:
+            Newest item or None if the buffer is empty
+        """
+        head = self._head
+        if self._tail == head:
+            return None
+            
+        item = self._slots[(head - 1) % self._capacity]
+        for position in range(self._tail, head):
+            self._slots[position % self._capacity] = None
+            
+        self._tail = head
+        return item
+        
+    def __len__(self):
+        """Number of buffered items."""
+        return self._head - self._tail
+
+
 class RocketEngineVirtualHardware:
     """
     Virtual hardware interface for a liquid rocket engine.
@@ -153,29 +512,37 @@ class RocketEngineVirtualHardware:
     def __init__(self):
         """Initialize the virtual hardware."""
         # Create virtual sensors
-        self.sensors = {
-            'chamber_pressure': VirtualSensor('Chamber Pressure', 'Pa', noise_level=0.03),
-            'chamber_temperature': VirtualSensor('Chamber Temperature', 'K', noise_level=0.02),
-            'fuel_flow_rate': VirtualSensor('Fuel Flow Rate', 'kg/s', noise_level=0.04),
-            'oxidizer_flow_rate': VirtualSensor('Oxidizer Flow Rate', 'kg/s', noise_level=0.04),
-            'thrust': VirtualSensor('Thrust', 'N', noise_level=0.05)
-        }
+        self.sensors = VirtualSensorBank([
+            ('chamber_pressure', 'Chamber Pressure', 'Pa', 0.03),
+            ('chamber_temperature', 'Chamber Temperature', 'K', 0.02),
+            ('fuel_flow_rate', 'Fuel Flow Rate', 'kg/s', 0.04),
+            ('oxidizer_flow_rate', 'Oxidizer Flow Rate', 'kg/s', 0.04),
+            ('thrust', 'Thrust', 'N', 0.05)
+        ])
         
         # Create virtual actuators
-        self.actuators = {
-            'fuel_valve': VirtualActuator('Fuel Valve', response_time=0.2),
-            'oxidizer_valve': VirtualActuator('Oxidizer Valve', response_time=0.2),
-            'igniter': VirtualActuator('Igniter', min_value=0.0, max_value=1.0, response_time=0.05)
-        }
+        self.actuators = VirtualActuatorBank([
+            ('fuel_valve', 'Fuel Valve', 0.0, 1.0, 0.2),
+            ('oxidizer_valve', 'Oxidizer Valve', 0.0, 1.0, 0.2),
+            ('igniter', 'Igniter', 0.0, 1.0, 0.05)
+        ])
         
         # Initialize internal state
         self.running = False
         self.ignited = False
+        self.ignition_start_time = -1.0  # Negative while no ignition sequence is in progress
         self.simulation_thread = None
         self.stop_event = threading.Event()
         
-        # Create data queue for communication between threads
-        self.data_queue = queue.Queue(maxsize=100)
+        # Double-buffered latest-state snapshot shared with other threads:
+        # [timestamp, sensor values..., actuator values..., ignited]
+        self._actuator_keys = self.actuators.keys
+        num_sensors = len(self.sensors.keys)
+        self._sensor_slice = slice(1, 1 + num_sensors)
+        self._actuator_slice = slice(1 + num_sensors, 1 + num_sensors + len(self._actuator_keys))
+        self._snapshots = [np.zeros(self._actuator_slice.stop + 1), np.zeros(self._actuator_slice.stop + 1)]
+        self._snap_idx = 0
+        self._snapshot_ready = False
         
         # Initialize internal simulation parameters
         self._init_simulation_params()
@@ -198,6 +565,17 @@ class RocketEngineVirtualHardware:
             'pressure_factor': 5e6  # Pa/(kg/s) - more realistic value
         }
         
+        # Engine kernel parameters, packed once as floats in compute_engine_state order
+        self._engine_params = (
+            float(self.sim_params['ambient_pressure']),
+            float(self.sim_params['chamber_pressure_max']),
+            float(self.sim_params['pressure_factor']),
+            float(self.sim_params['temperature_ambient']),
+            float(self.sim_params['temperature_combustion']),
+            np.pi * (self.sim_params['throat_diameter'] / 2)**2  # Throat area [m²]
+        )
+        self._ignition_delay = self.sim_params['ignition_delay']
+        
     def start(self):
         """Start the virtual hardware simulation."""
         if self.running:
@@ -206,13 +584,12 @@ class RocketEngineVirtualHardware:
             
         self.stop_event.clear()
         self.running = True
+        self._snapshot_ready = False
         
         # Reset sensors and actuators
-        for sensor in self.sensors.values():
-            sensor.set_value(0.0)
+        self.sensors.set_values(0.0)
             
-        for actuator in self.actuators.values():
-            actuator.set(0.0)
+        self.actuators.set_all(0.0)
             
         # Start simulation in separate thread
         self.simulation_thread = threading.Thread(
@@ -238,30 +615,39 @@ class RocketEngineVirtualHardware:
         self.ignited = False
         
         # Reset ignition timer
-        if hasattr(self, 'ignition_start_time'):
-            delattr(self, 'ignition_start_time')
+        self.ignition_start_time = -1.0
         
         # Reset sensors and actuators
-        for sensor in self.sensors.values():
-            sensor.set_value(0.0)
+        self.sensors.set_values(0.0)
             
-        for actuator in self.actuators.values():
-            actuator.set(0.0)
+        self.actuators.set_all(0.0)
             
         logger.info("Virtual hardware simulation stopped")
         return True
         
     def _simulation_loop(self):
         """Main simulation loop that runs in a separate thread."""
-        update_interval = 1.0 / self.sim_params['simulation_rate']
+        # Ticks are paced against absolute monotonic deadlines, so sleep jitter
+        # does not accumulate into drift
+        interval_ns = int(1e9 / self.sim_params['simulation_rate'])
+        next_deadline = time.monotonic_ns()
+        
+        # Offset from the monotonic clock to wall-clock time, for packet timestamps
+        wall_offset = time.time() - time.monotonic()
+        
+        # Loop-invariant lookups, resolved once per run
+        actuators = self.actuators
+        engine_params = self._engine_params
+        ignition_delay = self._ignition_delay
+        sensors = self.sensors
         
         while not self.stop_event.is_set():
-            loop_start = time.time()
+            # One clock read per tick, shared by every sensor and actuator
+            now = time.monotonic()
             
             # Read current actuator values
-            fuel_valve = self.actuators['fuel_valve'].read()
-            oxidizer_valve = self.actuators['oxidizer_valve'].read()
-            igniter = self.actuators['igniter'].read()
+            actuator_values = actuators.read_all(now)
+            fuel_valve, oxidizer_valve, igniter = actuator_values.tolist()
             
             # Calculate flow rates based on valve positions
             fuel_flow = fuel_valve * 0.3  # kg/s at max opening
@@ -270,94 +656,69 @@ class RocketEngineVirtualHardware:
             # Check ignition state
             if igniter > 0.7 and not self.ignited and fuel_flow > 0.05 and oxidizer_flow > 0.05:
                 # Start ignition sequence with delay
-                if not hasattr(self, 'ignition_start_time'):
-                    self.ignition_start_time = time.time()
+                if self.ignition_start_time < 0:
+                    self.ignition_start_time = now
                 
                 # Check if ignition delay has passed
-                if time.time() - self.ignition_start_time >= self.sim_params['ignition_delay']:
+                if now - self.ignition_start_time >= ignition_delay:
                     self.ignited = True
                     logger.info("Engine ignited")
             
-            # If ignition has occurred, simulate engine running
-            if self.ignited:
-                # Calculate mixture ratio
-                if fuel_flow > 1e-6:  # Avoid division by zero
-                    mixture_ratio = oxidizer_flow / fuel_flow
-                else:
-                    mixture_ratio = 0.0
-                    
-                # Calculate chamber pressure (simplified model)
-                total_flow = fuel_flow + oxidizer_flow
-                chamber_pressure = total_flow * self.sim_params['pressure_factor']
-                
-                # Ensure pressure is within realistic bounds
-                chamber_pressure = max(self.sim_params['ambient_pressure'], min(chamber_pressure, self.sim_params['chamber_pressure_max']))
-                
-                # Calculate chamber temperature (simplification)
-                if 1.5 < mixture_ratio < 4.0:
-                    # Good mixture ratio range
-                    temperature_factor = 0.9
-                else:
-                    # Suboptimal combustion
-                    temperature_factor = 0.7
-                    
-                chamber_temperature = self.sim_params['temperature_combustion'] * temperature_factor
+            # Engine physics for this tick (compiled when numba is available)
+            chamber_pressure, chamber_temperature, thrust = compute_engine_state(
+                fuel_flow, oxidizer_flow, self.ignited, *engine_params
+            )
+            
+            # Update sensor values
+            sensors.set_values((
+                chamber_pressure,
+                chamber_temperature,
+                fuel_flow,
+                oxidizer_flow,
+                thrust
+            ))
                 
-                # Calculate thrust (simplified)
-                # F = m_dot * v_e + (p_e - p_a) * A_e
-                # Simplified to: F = CF * A_t * p_c
-                throat_area = np.pi * (self.sim_params['throat_diameter'] / 2)**2
-                thrust_coefficient = 1.4  # Typical value for a decent nozzle
-                thrust = thrust_coefficient * throat_area * chamber_pressure
+            # Publish the state for other threads: fill the back buffer in place,
+            # then flip it to the front with a single int store
+            snapshot = self._snapshots[self._snap_idx ^ 1]
+            snapshot[0] = now + wall_offset
+            snapshot[self._sensor_slice] = sensors.read_all(now)
+            snapshot[self._actuator_slice] = actuator_values
+            snapshot[-1] = self.ignited
+            self._snap_idx ^= 1
+            self._snapshot_ready = True
                 
-                # Update sensor values
-                self.sensors['chamber_pressure'].set_value(chamber_pressure)
-                self.sensors['chamber_temperature'].set_value(chamber_temperature)
-                self.sensors['fuel_flow_rate'].set_value(fuel_flow)
-                self.sensors['oxidizer_flow_rate'].set_value(oxidizer_flow)
-                self.sensors['thrust'].set_value(thrust)
+            # Sleep until the next tick's deadline
+            next_deadline += interval_ns
+            remaining_ns = next_deadline - time.monotonic_ns()
+            if remaining_ns > 0:
+                time.sleep(remaining_ns / 1e9)
             else:
-                # Engine not ignited, set low/zero values for sensors
-                self.sensors['chamber_pressure'].set_value(self.sim_params['ambient_pressure'])
-                self.sensors['chamber_temperature'].set_value(self.sim_params['temperature_ambient'])
-                self.sensors['fuel_flow_rate'].set_value(fuel_flow)
-                self.sensors['oxidizer_flow_rate'].set_value(oxidizer_flow)
-                self.sensors['thrust'].set_value(0.0)
-                
-            # Push data to queue for other threads to use
-            sensor_data = {name: sensor.read() for name, sensor in self.sensors.items()}
-            actuator_data = {name: actuator.read() for name, actuator in self.actuators.items()}
-            
-            data_packet = {
-                'timestamp': time.time(),
-                'sensors': sensor_data,
-                'actuators': actuator_data,
-                'ignited': self.ignited
-            }
-            
-            try:
-                self.data_queue.put(data_packet, block=False)
-            except queue.Full:
-                # Queue is full, just drop this packet
-                pass
-                
-            # Sleep to maintain update rate
-            elapsed = time.time() - loop_start
-            if elapsed < update_interval:
-                time.sleep(update_interval - elapsed)
+                # Overran the tick: restart the schedule instead of bursting to catch up
+                next_deadline = time.monotonic_ns()
                 
     def get_latest_data(self):
         """
         Get the latest data packet from the simulation.
         
+        The packet is built on demand from the most recently published snapshot.
+        
         Returns:
             Latest data packet or None if no data is available
         """
-        try:
-            return self.data_queue.get(block=False)
-        except queue.Empty:
+        if not self._snapshot_ready:
             return None
             
+        # tolist() copies the front buffer in one call, before the producer reuses it
+        values = self._snapshots[self._snap_idx].tolist()
+        
+        return {
+            'timestamp': values[0],
+            'sensors': dict(zip(self.sensors.keys, values[self._sensor_slice])),
+            'actuators': dict(zip(self._actuator_keys, values[self._actuator_slice])),
+            'ignited': bool(values[-1])
+        }
+            
     def read_sensor(self, sensor_name):
         """
         Read a specific sensor value.
@@ -368,10 +729,44 @@ class RocketEngineVirtualHardware:
         Returns:
             Sensor value or None if sensor doesn't exist
         """
-        if sensor_name in self.sensors:
-            return self.sensors[sensor_name].read()
+        index = self.sensors.index.get(sensor_name)
+        if index is not None:
+            return self.sensors.read(index)
         return None
         
+    def sensor_index(self, sensor_name):
+        """
+        Look up the index of a sensor, for use with read_sensor_by_index.
+        
+        Args:
+            sensor_name: Name of the sensor
+            
+        Returns:
+            Sensor index or None if sensor doesn't exist
+        """
+        return self.sensors.index.get(sensor_name)
+        
+    def read_sensor_by_index(self, index):
+        """
+        Read a specific sensor value by index, skipping the name lookup.
+        
+        Args:
+            index: Sensor index from sensor_index
+            
+        Returns:
+            Sensor value
+        """
+        return self.sensors.read(index)
+        
+    def read_all_sensors(self):
+        """
+        Read all sensor values at once.
+        
+        Returns:
+            Array of sensor values, in the order of self.sensors.keys
+        """
+        return self.sensors.read_all()
+        
     def set_actuator(self, actuator_name, value):
         """
         Set a specific actuator value.
@@ -383,8 +778,9 @@ class RocketEngineVirtualHardware:
         Returns:
             True if successful, False otherwise
         """
-        if actuator_name in self.actuators:
-            self.actuators[actuator_name].set(value)
+        index = self.actuators.index.get(actuator_name)
+        if index is not None:
+            self.actuators.set(index, value)
             return True
         return False
         
@@ -413,21 +809,24 @@ class SerialHardwareInterface:
     This is a placeholder class for future implementation.
     """
     
-    def __init__(self, port, baudrate=115200):
+    def __init__(self, port, baudrate=115200, binary_frames=False):
         """
         Initialize the serial hardware interface.
         
         Args:
             port: Serial port to use
             baudrate: Baud rate for serial communication
+            binary_frames: Whether the controller sends fixed-size binary frames
+                           (SERIAL_FRAME) instead of ASCII lines
         """
         self.port = port
         self.baudrate = baudrate
+        self.binary_frames = binary_frames
         self.serial = None
         self.running = False
         self.read_thread = None
         self.stop_event = threading.Event()
-        self.data_queue = queue.Queue(maxsize=100)
+        self.data_queue = SPSCRing(100)
         
     def connect(self):
         """
@@ -443,7 +842,7 @@ class SerialHardwareInterface:
             # Start read thread
             self.stop_event.clear()
             self.read_thread = threading.Thread(
-                target=self._read_loop,
+                target=self._read_binary_loop if self.binary_frames else self._read_loop,
                 daemon=True
             )
             self.read_thread.start()
@@ -481,34 +880,90 @@ class SerialHardwareInterface:
                 
     def _read_loop(self):
         """Read data from the serial port in a separate thread."""
+        rx_buf = b''
+        resync = False  # Dropping bytes until the next newline after an overlong line
+        
         while not self.stop_event.is_set() and self.serial:
             try:
-                line = self.serial.readline().decode('utf-8').strip()
-                if line:
-                    # Parse the data format from STM32
-                    # Example format: "SENSOR:chamber_pressure:1234567"
-                    parts = line.split(':')
+                # Take everything already received in one read (blocks for at least a byte)
+                rx_buf += self.serial.read(self.serial.in_waiting or 1)
+                timestamp = time.time()
+                
+                # Parse every complete line; keep a trailing partial line for the next read
+                *lines, rx_buf = rx_buf.split(b'\n')
+                
+                if resync and lines:
+                    # The first complete line is the tail of the discarded one
+                    lines = lines[1:]
+                    resync = False
+                
+                if len(rx_buf) > SERIAL_MAX_LINE:
+                    logger.warning(f"No newline in {len(rx_buf)} bytes; discarding until next line")
+                    rx_buf = b''
+                    resync = True
+                
+                for line in lines:
+                    # Parse the data format from STM32 directly from bytes
+                    # (float() accepts bytes and ignores surrounding whitespace);
+                    # only the short type and name fields are decoded
+                    # Example format: b"SENSOR:chamber_pressure:1234567"
+                    parts = line.split(b':')
                     if len(parts) >= 3:
-                        data_type = parts[0]
-                        name = parts[1]
-                        value = parts[2]
-                        
                         try:
-                            value = float(value)
+                            value = float(parts[2])
                             
                             data_packet = {
-                                'timestamp': time.time(),
-                                'type': data_type,
-                                'name': name,
+                                'timestamp': timestamp,
+                                'type': parts[0].lstrip().decode('utf-8'),
+                                'name': parts[1].decode('utf-8'),
                                 'value': value
                             }
                             
-                            try:
-                                self.data_queue.put(data_packet, block=False)
-                            except queue.Full:
-                                pass
+                            self.data_queue.put(data_packet)
                         except ValueError:
-                            logger.warning(f"Invalid value received: {line}")
+                            logger.warning(f"Invalid value received: {line.decode('utf-8', 'replace').strip()}")
+            except Exception as e:
+                logger.error(f"Error reading from serial: {e}")
+                time.sleep(1.0)
+                
+    def _read_binary_loop(self):
+        """Read fixed-size binary frames from the serial port in a separate thread."""
+        frame_size = SERIAL_FRAME.size
+        rx_buf = b''
+        
+        while not self.stop_event.is_set() and self.serial:
+            try:
+                # Take everything already received in one read (blocks for at least a byte)
+                rx_buf += self.serial.read(self.serial.in_waiting or 1)
+                timestamp = time.time()
+                
+                # Parse every complete frame; keep a trailing partial frame for the next read
+                start = 0
+                while len(rx_buf) - start >= frame_size:
+                    end = start + frame_size
+                    if rx_buf[start] != SERIAL_FRAME_SYNC or rx_buf[end - 1] != sum(rx_buf[start + 1:end - 1]) & 0xFF:
+                        # Not aligned on a valid frame: resynchronize on the next sync byte
+                        sync = rx_buf.find(SERIAL_FRAME_SYNC, start + 1)
+                        start = sync if sync >= 0 else len(rx_buf)
+                        continue
+                        
+                    _, type_id, channel, value, _ = SERIAL_FRAME.unpack_from(rx_buf, start)
+                    start = end
+                    
+                    if type_id >= len(SERIAL_FRAME_TYPES) or channel >= len(SERIAL_CHANNELS):
+                        logger.warning(f"Unknown frame type {type_id} or channel {channel}")
+                        continue
+                        
+                    data_packet = {
+                        'timestamp': timestamp,
+                        'type': SERIAL_FRAME_TYPES[type_id],
+                        'name': SERIAL_CHANNELS[channel],
+                        'value': value
+                    }
+                    
+                    self.data_queue.put(data_packet)
+                    
+                rx_buf = rx_buf[start:]
             except Exception as e:
                 logger.error(f"Error reading from serial: {e}")
                 time.sleep(1.0)
@@ -548,10 +1003,28 @@ class SerialHardwareInterface:
         Returns:
             Latest data packet or None if no data is available
         """
-        try:
-            return self.data_queue.get(block=False)
-        except queue.Empty:
-            return None
+        return self.data_queue.get()
+        
+    def drain_all(self, max_items=None):
+        """
+        Get all pending data packets from the hardware at once.
+        
+        Args:
+            max_items: Maximum number of packets to return (None for all)
+            
+        Returns:
+            List of data packets, oldest first
+        """
+        return self.data_queue.drain(max_items)
+        
+    def get_latest_only(self):
+        """
+        Get the most recent data packet, discarding older pending ones.
+        
+        Returns:
+            Most recent data packet or None if no data is available
+        """
+        return self.data_queue.get_latest()
 
 
 def get_hardware_interface(use_virtual=True, port=None):
@@ -2,6 +2,28 @@ import numpy as np
 import time
 
 
+def clamp(value, limits):
+    """
+    Clamp a scalar to (min, max) limits with plain comparisons.
+    
+    Cheaper than np.clip for a single Python float, which goes through NumPy's
+    array conversion and ufunc dispatch on every controller update.
+    
+    Args:
+        value: Scalar to clamp
+        limits: Tuple (min, max); either bound may be None
+        
+    Returns:
+        Clamped value
+    """
+    lower, upper = limits
+    if upper is not None and value > upper:
+        return upper
+    if lower is not None and value < lower:
+        return lower
+    return value
+
+
 class PIDController:
     """
     PID controller for rocket engine control.
@@ -111,7 +133,7 @@ class PIDController:
         
         # Apply integral limits if specified
         if self.integral_limits is not None:
-            self.integral = np.clip(self.integral, *self.integral_limits)
+            self.integral = clamp(self.integral, self.integral_limits)
             
         # Derivative term (on measurement or error)
         if self.differential_on_measurement:
@@ -124,7 +146,7 @@ class PIDController:
         
         # Apply output limits if specified
         if self.output_limits is not None:
-            self.output = np.clip(self.output, *self.output_limits)
+            self.output = clamp(self.output, self.output_limits)
             
         # Update internal state
         self.last_error = error
@@ -212,6 +234,7 @@ class PINNGuidedPIDController(PIDController):
         self.pinn_model = pinn_model
         self.prediction_horizon = 5  # Number of time steps to predict ahead
         self.prediction_dt = 0.1  # Time step for predictions
+        self._input_buf = None  # Reused input tensor for predictions
         
     def set_pinn_model(self, pinn_model):
         """
@@ -235,24 +258,21 @@ class PINNGuidedPIDController(PIDController):
         if self.pinn_model is None:
             return None
             
-        # Create input array for predictions
-        predictions = []
+        import torch
         
-        # Create batch of future time steps
-        input_batch = np.tile(current_state, (self.prediction_horizon, 1))
+        # Reuse a persistent input tensor, filled in place through its NumPy view
+        if self._input_buf is None or self._input_buf.shape[0] != self.prediction_horizon:
+            self._input_buf = torch.empty((self.prediction_horizon, len(current_state)), dtype=torch.float32)
+        input_batch = self._input_buf.numpy()
+        input_batch[:] = current_state
         
         # Set time steps for prediction
         current_time = current_state[6]  # Assuming time is at index 6
-        for i in range(self.prediction_horizon):
-            input_batch[i, 6] = current_time + (i + 1) * self.prediction_dt
-            
-        # Convert to torch tensor (assuming PyTorch model)
-        import torch
-        input_tensor = torch.tensor(input_batch, dtype=torch.float32)
+        input_batch[:, 6] = current_time + np.arange(1, self.prediction_horizon + 1) * self.prediction_dt
         
         # Get predictions
-        with torch.no_grad():
-            predicted_outputs = self.pinn_model(input_tensor).cpu().numpy()
+        with torch.inference_mode():
+            predicted_outputs = self.pinn_model(self._input_buf).cpu().numpy()
             
         return predicted_outputs
         
@@ -297,7 +317,7 @@ class PINNGuidedPIDController(PIDController):
         
         # Apply output limits if specified
         if self.output_limits is not None:
-            blended_output = np.clip(blended_output, *self.output_limits)
+            blended_output = clamp(blended_output, self.output_limits)
             
         self.output = blended_output
         
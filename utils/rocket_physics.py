@@ -4,6 +4,18 @@ import torch
 # Constants
 R_UNIVERSAL = 8.314  # Universal gas constant [J/(mol·K)]
 G_0 = 9.81  # Standard gravity [m/s²]
+INV_G_0 = 1.0 / G_0  # Reciprocal of standard gravity [s²/m]
+
+# Combustion products lookup table for methane + nitrous oxide.
+# Rows: fuel-rich (O/F < 2.0), near stoichiometric (2.0-3.5), oxidizer-rich (O/F > 3.5)
+# Columns: gamma, molecular weight [kg/mol], combustion temperature [K]
+METHANE_N2O_MR_BREAKPOINTS = np.array([2.0, np.nextafter(3.5, np.inf)])
+METHANE_N2O_PROPERTIES = np.array([
+    [1.22, 0.024, 2700],
+    [1.25, 0.026, 3100],
+    [1.30, 0.028, 2800]
+])
+DEFAULT_COMBUSTION_PROPERTIES = np.array([1.25, 0.026, 3000])
 
 
 def calculate_thrust(chamber_pressure, throat_area, exit_area, exit_pressure, ambient_pressure, exit_velocity, mass_flow_rate, gamma=1.4):
@@ -42,7 +54,7 @@ def calculate_isp(thrust, mass_flow_rate):
     Returns:
         Specific impulse [s]
     """
-    return thrust / (mass_flow_rate * G_0)
+    return thrust * INV_G_0 / mass_flow_rate
 
 
 def calculate_exit_mach(expansion_ratio, gamma=1.4):
@@ -50,6 +62,9 @@ def calculate_exit_mach(expansion_ratio, gamma=1.4):
     Calculate exit Mach number based on area expansion ratio.
     Uses iterative method to solve the area-Mach relation.
     
+    Accepts scalars or NumPy arrays; array inputs are solved elementwise
+    in a single pass per iteration.
+    
     Args:
         expansion_ratio: Ratio of exit area to throat area
         gamma: Specific heat ratio
@@ -57,8 +72,15 @@ def calculate_exit_mach(expansion_ratio, gamma=1.4):
     Returns:
         Exit Mach number
     """
+    expansion_ratio = np.asarray(expansion_ratio, dtype=float)
+    gamma = np.asarray(gamma, dtype=float)
+    shape = np.broadcast(expansion_ratio, gamma).shape
+    
     # Initial guess
-    M = 2.0
+    M = np.full(shape, 2.0)
+    
+    # Elements still iterating (converged elements are frozen)
+    active = np.ones(shape, dtype=bool)
     
     # Iterative solution to area-Mach relation
     for _ in range(100):
@@ -67,16 +89,56 @@ def calculate_exit_mach(expansion_ratio, gamma=1.4):
         term2 = ((1 + (gamma - 1) / 2 * M**2) / ((gamma + 1) / 2))**((gamma + 1) / (2 * (gamma - 1)))
         A_ratio = term1 * term2
         
-        if abs(A_ratio - expansion_ratio) < 1e-6:
+        active &= np.abs(A_ratio - expansion_ratio) >= 1e-6
+        if not active.any():
             break
         
         # Update Mach number
-        if A_ratio < expansion_ratio:
-            M += 0.1
-        else:
-            M -= 0.05
+        step = np.where(A_ratio < expansion_ratio, 0.1, -0.05)
+        M = np.where(active, M + step, M)
             
-    return M
+    return M[()]
+
+
+def calculate_exit_mach_vec(expansion_ratio, gamma=1.4, num_iterations=25):
+    """
+    Calculate supersonic exit Mach number with a fixed-iteration Newton solve.
+    
+    Solves ln(A/A*)(M) = ln(expansion_ratio) elementwise with no branching or
+    convergence checks, so every iteration is one pass over the arrays.
+    Expansion ratios at or below 1 have no supersonic solution and return a
+    sonic exit (M = 1).
+    
+    Args:
+        expansion_ratio: Ratio of exit area to throat area (scalar or array)
+        gamma: Specific heat ratio (scalar or array)
+        num_iterations: Number of Newton iterations
+        
+    Returns:
+        Exit Mach number
+    """
+    expansion_ratio = np.asarray(expansion_ratio, dtype=float)
+    gamma = np.asarray(gamma, dtype=float)
+    
+    half_gm1 = (gamma - 1) / 2
+    exponent = (gamma + 1) / (2 * (gamma - 1))
+    log_eps = np.log(np.maximum(expansion_ratio, 1.0))
+    
+    # Initial guess on the supersonic branch
+    M = np.full(np.broadcast(expansion_ratio, gamma).shape, 2.0)
+    
+    for _ in range(num_iterations):
+        M2 = M * M
+        stagnation = 1 + half_gm1 * M2
+        
+        # f(M) = ln(A/A*) - ln(eps), f'(M) = (M^2 - 1) / (M * (1 + (gamma-1)/2 * M^2))
+        f = exponent * np.log(stagnation / (1 + half_gm1)) - np.log(M) - log_eps
+        fp = (M2 - 1) / (M * stagnation)
+        
+        # Stay on the supersonic branch
+        M = np.maximum(M - f / fp, 1.0 + 1e-6)
+        
+    return np.where(expansion_ratio > 1.0, M, 1.0)[()]
 
 
 def calculate_exit_velocity(chamber_temperature, exit_mach, gamma=1.4, molecular_weight=0.028):
@@ -196,7 +258,7 @@ def create_combustion_products_properties(mixture_ratio, fuel_type="methane", ox
     Estimate combustion products properties based on mixture ratio and propellants.
     
     Args:
-        mixture_ratio: Oxidizer to fuel ratio (O/F)
+        mixture_ratio: Oxidizer to fuel ratio (O/F), scalar or array
         fuel_type: Type of fuel
         oxidizer_type: Type of oxidizer
         
@@ -206,34 +268,22 @@ def create_combustion_products_properties(mixture_ratio, fuel_type="methane", ox
         - molecular_weight: Molecular weight [kg/mol]
         - combustion_temperature: Combustion temperature [K]
     """
+    mixture_ratio = np.asarray(mixture_ratio, dtype=float)
+    
     # Default properties for methane + nitrous oxide
     if fuel_type.lower() == "methane" and oxidizer_type.lower() == "nitrous_oxide":
         # These are approximate values and would vary based on exact mixture ratio
-        if mixture_ratio < 2.0:
-            # Fuel-rich mixture
-            gamma = 1.22
-            molecular_weight = 0.024
-            combustion_temp = 2700
-        elif mixture_ratio <= 3.5:
-            # Near stoichiometric
-            gamma = 1.25
-            molecular_weight = 0.026
-            combustion_temp = 3100
-        else:
-            # Oxidizer-rich
-            gamma = 1.30
-            molecular_weight = 0.028
-            combustion_temp = 2800
+        # One table gather per sample instead of per-regime comparisons
+        regime = np.searchsorted(METHANE_N2O_MR_BREAKPOINTS, mixture_ratio, side='right')
+        properties = METHANE_N2O_PROPERTIES[regime]
     else:
         # Default values if specific propellant combination is not defined
-        gamma = 1.25
-        molecular_weight = 0.026
-        combustion_temp = 3000
+        properties = np.broadcast_to(DEFAULT_COMBUSTION_PROPERTIES, mixture_ratio.shape + (3,))
     
     return {
-        "gamma": gamma,
-        "molecular_weight": molecular_weight,
-        "combustion_temperature": combustion_temp
+        "gamma": properties[..., 0][()],
+        "molecular_weight": properties[..., 1][()],
+        "combustion_temperature": properties[..., 2][()]
     }
 
 
@@ -2,9 +2,11 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import time
 import sys
 import os
+from io import BytesIO
 import torch
 
 # Important: Add this line to disable automatic monitoring of torch modules by streamlit
@@ -15,38 +17,54 @@ if hasattr(torch, '_C'):
 # Add parent directory to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from models.pinn_model import RocketEnginePINN, train_pinn
-from utils.rocket_physics import (
-    calculate_thrust,
-    calculate_exit_velocity,
-    calculate_mass_flow_rate,
-    calculate_exit_mach,
-    calculate_pressure_ratio,
-    create_combustion_products_properties
-)
+from models.pinn_model import RocketEnginePINN, train_pinn, quantize_for_inference
 from utils.pid_controller import PIDController, PINNGuidedPIDController
-from data.data_generator import RocketEngineDataGenerator
+from utils.rocket_physics import calculate_isp
 
+# Controlled variables: name (results column) -> (plot label, plot scale)
+CONTROL_VARIABLES = {
+    "Thrust": ("Thrust [N]", 1.0),
+    "Chamber Pressure": ("Chamber Pressure [MPa]", 1e-6)
+}
 
+# Columns of the PID simulation results buffer
+PID_RESULT_COLUMNS = ['Time', 'Chamber Pressure', 'Exit Velocity', 'Thrust',
+                      'Control Output', 'Fuel Flow Rate']
+
+# Parameter sensitivity sweeps: name -> (input index, sweep range, plot unit, plot scale)
+SENSITIVITY_PARAMETERS = {
+    "Mixture Ratio": (0, (1.5, 4.0), "", 1.0),
+    "Chamber Pressure": (1, (1.0e6, 5.0e6), "MPa", 1e-6),
+    "Throat Diameter": (4, (0.01, 0.05), "mm", 1e3),
+    "Exit Diameter": (5, (0.03, 0.15), "mm", 1e3),
+    "Fuel Flow Rate": (7, (0.05, 0.5), "g/s", 1e3)
+}
+
+
+@st.cache_resource(show_spinner=False)
 def load_or_create_model(load_existing=False, model_path='models/rocket_engine_pinn.pt'):
     """
     Load existing model or create a new one if not available.
     
+    Cached as a resource: the model is loaded (or trained) once per process
+    and the same inference-only object is shared by every rerun and session.
+    
     Args:
         load_existing: Whether to try loading an existing model
         model_path: Path to saved model
         
     Returns:
-        Trained PINN model
+        Trained PINN model, int8-quantized for inference
     """
     model = RocketEnginePINN()
     
     if load_existing and os.path.exists(model_path):
-        model.load_state_dict(torch.load(model_path))
-        model.eval()
-        return model
+        model.load_state_dict(torch.load(model_path, mmap=True, weights_only=True, map_location='cpu'))
+        return quantize_for_inference(model)
     
-    # Generate training data
+    # Generate training data (the generator and its optional numba kernel are
+    # only imported when there is no saved model to load)
+    from data.data_generator import RocketEngineDataGenerator
     generator = RocketEngineDataGenerator()
     inputs, outputs = generator.generate_dataset(num_samples=2000)
     
@@ -68,8 +86,7 @@ def load_or_create_model(load_existing=False, model_path='models/rocket_engine_p
     os.makedirs(os.path.dirname(model_path), exist_ok=True)
     torch.save(model.state_dict(), model_path)
     
-    model.eval()
-    return model
+    return quantize_for_inference(model)
 
 
 def create_engine_simulator(model, time_span=10.0, time_step=0.1):
@@ -87,8 +104,15 @@ def create_engine_simulator(model, time_span=10.0, time_step=0.1):
     time_points = np.arange(0, time_span, time_step)
     num_steps = len(time_points)
     
+    # Input array reused by every call: the time column is filled once and the
+    # parameter columns are overwritten in place
+    inputs = np.zeros((num_steps, 8), dtype=np.float32)
+    inputs[:, 6] = time_points
+    inputs_tensor = torch.from_numpy(inputs)
+    
     def simulator(mixture_ratio, chamber_pressure, chamber_temperature, 
-                 chamber_volume, throat_diameter, exit_diameter, fuel_flow_rate):
+                 chamber_volume, throat_diameter, exit_diameter, fuel_flow_rate,
+                 num_points=None):
         """
         Simulate rocket engine behavior over time.
         
@@ -100,31 +124,26 @@ def create_engine_simulator(model, time_span=10.0, time_step=0.1):
             throat_diameter: Throat diameter [m]
             exit_diameter: Exit diameter [m]
             fuel_flow_rate: Fuel flow rate [kg/s]
+            num_points: Only evaluate the first num_points time points
+                (default: the whole time span)
             
         Returns:
             DataFrame with simulation results
         """
-        # Create input array
-        inputs = np.zeros((num_steps, 8))
-        
-        # Fill constant parameters
-        inputs[:, 0] = mixture_ratio  # Mixture ratio
-        inputs[:, 1] = chamber_pressure  # Initial chamber pressure
-        inputs[:, 2] = chamber_temperature  # Chamber temperature
-        inputs[:, 3] = chamber_volume  # Chamber volume
-        inputs[:, 4] = throat_diameter  # Throat diameter
-        inputs[:, 5] = exit_diameter  # Exit diameter
-        inputs[:, 7] = fuel_flow_rate  # Fuel flow rate
-        
-        # Fill time points
-        inputs[:, 6] = time_points
+        batch = inputs[:num_points]
         
-        # Convert to tensor
-        inputs_tensor = torch.tensor(inputs, dtype=torch.float32)
+        # Fill constant parameters (the tensor shares this array's memory)
+        batch[:, 0] = mixture_ratio  # Mixture ratio
+        batch[:, 1] = chamber_pressure  # Initial chamber pressure
+        batch[:, 2] = chamber_temperature  # Chamber temperature
+        batch[:, 3] = chamber_volume  # Chamber volume
+        batch[:, 4] = throat_diameter  # Throat diameter
+        batch[:, 5] = exit_diameter  # Exit diameter
+        batch[:, 7] = fuel_flow_rate  # Fuel flow rate
         
         # Get predictions
         with torch.no_grad():
-            outputs = model(inputs_tensor).cpu().numpy()
+            outputs = model(inputs_tensor[:num_points]).cpu().numpy()
             
         # Extract outputs
         chamber_pressure_out = outputs[:, 0]
@@ -133,7 +152,7 @@ def create_engine_simulator(model, time_span=10.0, time_step=0.1):
         
         # Create DataFrame
         results = pd.DataFrame({
-            'Time': time_points,
+            'Time': time_points[:num_points],
             'Chamber Pressure': chamber_pressure_out,
             'Exit Velocity': exit_velocity,
             'Thrust': thrust
@@ -144,6 +163,28 @@ def create_engine_simulator(model, time_span=10.0, time_step=0.1):
     return simulator
 
 
+@st.cache_data(max_entries=256, show_spinner=False)
+def run_engine_simulation(_simulator, simulation_time, engine_params):
+    """
+    Run the engine simulator, cached on its inputs.
+    
+    Re-running with unchanged sliders returns the stored results instead of
+    evaluating the PINN again. The simulator itself is excluded from the cache
+    key (leading underscore); its time span is keyed via simulation_time.
+    
+    Args:
+        _simulator: Engine simulator function
+        simulation_time: Time span the simulator was created with [s]
+        engine_params: Tuple of simulator arguments (mixture ratio, chamber
+            pressure, chamber temperature, chamber volume, throat diameter,
+            exit diameter, fuel flow rate)
+        
+    Returns:
+        DataFrame with simulation results
+    """
+    return _simulator(*engine_params)
+
+
 def run_pid_simulation(simulator, pid_controller, setpoint, control_variable='Thrust',
                        simulation_time=10.0, time_step=0.1):
     """
@@ -176,30 +217,43 @@ def run_pid_simulation(simulator, pid_controller, setpoint, control_variable='Th
     time_points = np.arange(0, simulation_time, time_step)
     num_steps = len(time_points)
     
-    # Arrays to store results
-    chamber_pressure_arr = np.zeros(num_steps)
-    exit_velocity_arr = np.zeros(num_steps)
-    thrust_arr = np.zeros(num_steps)
-    control_output_arr = np.zeros(num_steps)
-    fuel_flow_arr = np.zeros(num_steps)
+    # Single results buffer; the per-variable arrays are column views into it
+    history = np.zeros((num_steps, len(PID_RESULT_COLUMNS)))
+    history[:, 0] = time_points
+    (chamber_pressure_arr, exit_velocity_arr, thrust_arr,
+     control_output_arr, fuel_flow_arr) = history[:, 1:].T
+    
+    # Measurement fed to the controller, selected once instead of per step
+    measured_arr = {
+        'Thrust': thrust_arr,
+        'Chamber Pressure': chamber_pressure_arr
+    }[control_variable]
+    
+    # Fuel flow rate of the last simulator call (only input that changes per step)
+    last_fuel_flow_rate = None
     
     # Run simulation
     for i, t in enumerate(time_points):
-        # Run simulator with current parameters
-        results = simulator(
-            mixture_ratio, 
-            chamber_pressure, 
-            chamber_temperature, 
-            chamber_volume, 
-            throat_diameter, 
-            exit_diameter, 
-            fuel_flow_rate
-        )
-        
-        # Get values at current time step
-        current_pressure = results['Chamber Pressure'].iloc[0]
-        current_velocity = results['Exit Velocity'].iloc[0]
-        current_thrust = results['Thrust'].iloc[0]
+        # Re-run the simulator only when its inputs changed (e.g. not while the
+        # controller output is saturated at a limit). Only the first time point
+        # is used, so only that one is evaluated.
+        if fuel_flow_rate != last_fuel_flow_rate:
+            results = simulator(
+                mixture_ratio, 
+                chamber_pressure, 
+                chamber_temperature, 
+                chamber_volume, 
+                throat_diameter, 
+                exit_diameter, 
+                fuel_flow_rate,
+                num_points=1
+            )
+            last_fuel_flow_rate = fuel_flow_rate
+            
+            # Get values at current time step
+            current_pressure = results['Chamber Pressure'].iloc[0]
+            current_velocity = results['Exit Velocity'].iloc[0]
+            current_thrust = results['Thrust'].iloc[0]
         
         # Store results
         chamber_pressure_arr[i] = current_pressure
@@ -208,30 +262,318 @@ def run_pid_simulation(simulator, pid_controller, setpoint, control_variable='Th
         fuel_flow_arr[i] = fuel_flow_rate
         
         # Update PID controller
-        if control_variable == 'Thrust':
-            control_output = pid_controller.update(current_thrust, t)
-        else:  # Chamber Pressure
-            control_output = pid_controller.update(current_pressure, t)
-            
+        control_output = pid_controller.update(measured_arr[i], t)
+        
         control_output_arr[i] = control_output
         
         # Update fuel flow rate based on controller output
         # Assuming flow rate is directly controlled
         fuel_flow_rate = control_output
     
-    # Create DataFrame with results
-    results_df = pd.DataFrame({
-        'Time': time_points,
-        'Chamber Pressure': chamber_pressure_arr,
-        'Exit Velocity': exit_velocity_arr,
-        'Thrust': thrust_arr,
-        'Control Output': control_output_arr,
-        'Fuel Flow Rate': fuel_flow_arr
-    })
+    # Wrap the results buffer in a DataFrame without copying
+    results_df = pd.DataFrame(history, columns=PID_RESULT_COLUMNS, copy=False)
     
     return results_df
 
 
+def calculate_pid_metrics(time_points, measured, setpoint):
+    """
+    Compute PID performance metrics with vectorized NumPy operations.
+    
+    Args:
+        time_points: Simulation time points [s]
+        measured: Controlled variable at each time point
+        setpoint: Controller setpoint
+        
+    Returns:
+        Tuple of (settling time [s] or None, overshoot [%], steady-state error [%])
+    """
+    time_points = np.asarray(time_points)
+    measured = np.asarray(measured)
+    
+    # First time the error is within 5% of the setpoint
+    within_band = np.abs(setpoint - measured) < 0.05 * setpoint
+    settling_index = np.argmax(within_band)
+    settling_time = time_points[settling_index] if within_band[settling_index] else None
+    
+    # Overshoot above the setpoint
+    overshoot = max(measured.max() - setpoint, 0) / setpoint * 100
+    
+    # Steady-state error over the last 20 samples
+    ss_error = (setpoint - measured[-20:].mean()) / setpoint * 100
+    
+    return settling_time, overshoot, ss_error
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def predict_parameter_sweep(_model, base_inputs, param_index, values):
+    """
+    Predict engine outputs while sweeping one input parameter.
+    
+    Cached on the base parameters and sweep values so Streamlit reruns that
+    don't touch them (e.g. changing controller settings) reuse the predictions.
+    The model is excluded from the cache key (leading underscore).
+    
+    Args:
+        _model: Trained PINN model
+        base_inputs: Tuple of the 8 model inputs held fixed during the sweep
+        param_index: Index of the input being varied
+        values: Values taken by the varied input
+        
+    Returns:
+        Array of shape [len(values), 3] with predicted chamber pressure,
+        exit velocity and thrust
+    """
+    # Create input batch: one row per sweep value
+    inputs = np.tile(np.asarray(base_inputs, dtype=np.float32), (len(values), 1))
+    
+    # Set varied parameter
+    inputs[:, param_index] = values
+    
+    # Get predictions in a single forward pass
+    with torch.inference_mode():
+        predictions = _model(torch.from_numpy(inputs)).numpy()
+        
+    return predictions
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_sensitivity_image(_model, base_inputs, param_name):
+    """
+    Render the parameter-sensitivity figure to PNG, cached on its inputs.
+    
+    Caching the rendered bytes (rather than the Figure) skips the PNG render on
+    reruns and gives each session its own copy, so no matplotlib object is
+    shared between Streamlit's session threads. Uses the Figure API rather
+    than pyplot so nothing is kept in pyplot's global figure registry.
+    
+    Args:
+        _model: Trained PINN model
+        base_inputs: Tuple of the 8 model inputs held fixed during the sweep
+        param_name: Key into SENSITIVITY_PARAMETERS
+        
+    Returns:
+        PNG bytes of thrust and exit velocity against the parameter
+    """
+    # Create parameter variations
+    param_index, (min_val, max_val), param_unit, plot_scale = SENSITIVITY_PARAMETERS[param_name]
+    values = np.linspace(min_val, max_val, 6)
+    
+    # Run simulations with parameter variations (cached across reruns)
+    predictions = predict_parameter_sweep(_model, base_inputs, param_index, values)
+    
+    fig = Figure(figsize=(12, 6))
+    ax1, ax2 = fig.subplots(1, 2)
+    
+    # Plot in display units, one scatter call per axis (point i keeps color cycle entry Ci)
+    label_vals = values * plot_scale
+    colors = [f"C{i}" for i in range(len(values))]
+    
+    ax1.scatter(label_vals, predictions[:, 2], c=colors)  # Thrust
+    ax2.scatter(label_vals, predictions[:, 1], c=colors)  # Exit Velocity
+    
+    # Add axis labels
+    ax1.set_xlabel(f"{param_name} [{param_unit}]")
+    ax1.set_ylabel("Thrust [N]")
+    ax1.grid(True)
+    
+    ax2.set_xlabel(f"{param_name} [{param_unit}]")
+    ax2.set_ylabel("Exit Velocity [m/s]")
+    ax2.grid(True)
+    
+    fig.tight_layout()
+    
+    # Same resolution and cropping st.pyplot uses
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")
+    
+    return buf.getvalue()
+
+
+@st.fragment
+def render_parameter_sensitivity(model, base_inputs):
+    """
+    Render the parameter-sensitivity plot of the PINN Internals tab.
+    
+    Runs as a fragment: changing the parameter to vary reruns only this
+    function, not the simulations and plots in the rest of the script.
+    
+    Args:
+        model: Trained PINN model
+        base_inputs: Tuple of the 8 model inputs held fixed during the sweep
+    """
+    param_name = st.selectbox(
+        "Parameter to Vary",
+        options=list(SENSITIVITY_PARAMETERS),
+        index=0
+    )
+    
+    st.image(build_sensitivity_image(model, base_inputs, param_name), use_column_width=True)
+
+
+@st.fragment
+def render_engine_simulation(simulator, simulation_time, engine_params):
+    """
+    Render the Engine Simulation tab.
+    
+    Runs as a fragment: pressing the button reruns only this function, not
+    the sidebar, model loading and the other tabs.
+    
+    Args:
+        simulator: Engine simulator function
+        simulation_time: Simulation time [s]
+        engine_params: Tuple of (mixture_ratio, chamber_pressure, chamber_temperature,
+                       chamber_volume, throat_diameter, exit_diameter, fuel_flow_rate)
+    """
+    mixture_ratio, _, _, _, throat_diameter, exit_diameter, fuel_flow_rate = engine_params
+    
+    col1, col2 = st.columns(2)
+    
+    if col1.button("Run Engine Simulation", use_container_width=True):
+        # Run simulator (cached on the engine parameters)
+        results = run_engine_simulation(simulator, simulation_time, engine_params)
+        
+        # Create plots
+        fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(10, 12))
+        
+        # Chamber pressure
+        ax1.plot(results['Time'], results['Chamber Pressure']/1e6, 'b-')
+        ax1.set_ylabel('Chamber Pressure [MPa]')
+        ax1.set_xlabel('Time [s]')
+        ax1.grid(True)
+        
+        # Exit velocity
+        ax2.plot(results['Time'], results['Exit Velocity'], 'g-')
+        ax2.set_ylabel('Exit Velocity [m/s]')
+        ax2.set_xlabel('Time [s]')
+        ax2.grid(True)
+        
+        # Thrust
+        ax3.plot(results['Time'], results['Thrust'], 'r-')
+        ax3.set_ylabel('Thrust [N]')
+        ax3.set_xlabel('Time [s]')
+        ax3.grid(True)
+        
+        plt.tight_layout()
+        st.pyplot(fig)
+        
+        # Display numerical results
+        col2.subheader("Steady-State Results")
+        
+        # Calculate average of last few points for steady state
+        steady_state = results.iloc[-10:].mean()
+        
+        col2.metric("Chamber Pressure", f"{steady_state['Chamber Pressure']/1e6:.2f} MPa")
+        col2.metric("Exit Velocity", f"{steady_state['Exit Velocity']:.2f} m/s")
+        col2.metric("Thrust", f"{steady_state['Thrust']:.2f} N")
+        
+        # Calculate expansion ratio and ISP
+        # A_e/A_t: the pi/4 factors of the two circular areas cancel
+        expansion_ratio = (exit_diameter / throat_diameter)**2
+        
+        total_flow = fuel_flow_rate * (1 + mixture_ratio)
+        isp = calculate_isp(steady_state['Thrust'], total_flow)
+        
+        col2.metric("Expansion Ratio", f"{expansion_ratio:.2f}")
+        col2.metric("Specific Impulse", f"{isp:.2f} s")
+
+
+@st.fragment
+def render_pid_simulation(model, simulator, control_variable, setpoint, gains,
+                          use_pinn_controller, simulation_time):
+    """
+    Render the PID Control tab.
+    
+    Runs as a fragment: pressing the button reruns only this function, not
+    the sidebar, model loading and the other tabs.
+    
+    Args:
+        model: Trained PINN model
+        simulator: Engine simulator function
+        control_variable: Variable to control ('Thrust' or 'Chamber Pressure')
+        setpoint: Target value for the control variable
+        gains: Tuple of (kp, ki, kd)
+        use_pinn_controller: Whether to use the PINN-guided PID controller
+        simulation_time: Simulation time [s]
+    """
+    kp, ki, kd = gains
+    
+    if st.button("Run PID Simulation", use_container_width=True):
+        # Create controller
+        if use_pinn_controller:
+            controller = PINNGuidedPIDController(
+                pinn_model=model,
+                kp=kp,
+                ki=ki,
+                kd=kd,
+                setpoint=setpoint,
+                output_limits=(0.05, 0.5)  # Fuel flow rate limits
+            )
+        else:
+            controller = PIDController(
+                kp=kp,
+                ki=ki,
+                kd=kd,
+                setpoint=setpoint,
+                output_limits=(0.05, 0.5)  # Fuel flow rate limits
+            )
+        
+        # Run PID simulation
+        results = run_pid_simulation(
+            simulator,
+            controller,
+            setpoint,
+            control_variable,
+            simulation_time
+        )
+        
+        # Create plots
+        fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(10, 12))
+        
+        # Control variable (Thrust or Chamber Pressure)
+        measured = results[control_variable]
+        plot_label, plot_scale = CONTROL_VARIABLES[control_variable]
+        
+        ax1.plot(results['Time'], measured*plot_scale, 'b-', label='Actual')
+        ax1.axhline(y=setpoint*plot_scale, color='r', linestyle='--', label='Setpoint')
+        ax1.set_ylabel(plot_label)
+        ax1.set_xlabel('Time [s]')
+        ax1.grid(True)
+        ax1.legend()
+        
+        # Control output (fuel flow rate)
+        ax2.plot(results['Time'], results['Fuel Flow Rate']*1000, 'g-')
+        ax2.set_ylabel('Fuel Flow Rate [g/s]')
+        ax2.set_xlabel('Time [s]')
+        ax2.grid(True)
+        
+        # Error
+        error = setpoint - measured
+        
+        ax3.plot(results['Time'], error, 'r-')
+        ax3.set_ylabel('Error')
+        ax3.set_xlabel('Time [s]')
+        ax3.grid(True)
+        
+        plt.tight_layout()
+        st.pyplot(fig)
+        
+        # Calculate performance metrics
+        settling_time, overshoot, ss_error = calculate_pid_metrics(
+            results['Time'].to_numpy(),
+            measured.to_numpy(),
+            setpoint
+        )
+        
+        if settling_time:
+            st.metric("Settling Time", f"{settling_time:.2f} s")
+            
+        st.metric("Overshoot", f"{overshoot:.2f}%")
+        
+        # Steady-state error
+        st.metric("Steady-State Error", f"{abs(ss_error):.2f}%")
+
+
 def main():
     st.set_page_config(
         page_title="Rocket Engine PINN Simulator",
@@ -353,163 +695,28 @@ def main():
     with tab1:
         st.header("Engine Simulation")
         
-        col1, col2 = st.columns(2)
-        
-        if col1.button("Run Engine Simulation", use_container_width=True):
-            # Run simulator
-            results = simulator(
-                mixture_ratio, 
-                chamber_pressure, 
-                chamber_temperature, 
-                chamber_volume, 
-                throat_diameter, 
-                exit_diameter, 
-                fuel_flow_rate
-            )
-            
-            # Create plots
-            fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(10, 12))
-            
-            # Chamber pressure
-            ax1.plot(results['Time'], results['Chamber Pressure']/1e6, 'b-')
-            ax1.set_ylabel('Chamber Pressure [MPa]')
-            ax1.set_xlabel('Time [s]')
-            ax1.grid(True)
-            
-            # Exit velocity
-            ax2.plot(results['Time'], results['Exit Velocity'], 'g-')
-            ax2.set_ylabel('Exit Velocity [m/s]')
-            ax2.set_xlabel('Time [s]')
-            ax2.grid(True)
-            
-            # Thrust
-            ax3.plot(results['Time'], results['Thrust'], 'r-')
-            ax3.set_ylabel('Thrust [N]')
-            ax3.set_xlabel('Time [s]')
-            ax3.grid(True)
-            
-            plt.tight_layout()
-            st.pyplot(fig)
-            
-            # Display numerical results
-            col2.subheader("Steady-State Results")
-            
-            # Calculate average of last few points for steady state
-            steady_state = results.iloc[-10:].mean()
-            
-            col2.metric("Chamber Pressure", f"{steady_state['Chamber Pressure']/1e6:.2f} MPa")
-            col2.metric("Exit Velocity", f"{steady_state['Exit Velocity']:.2f} m/s")
-            col2.metric("Thrust", f"{steady_state['Thrust']:.2f} N")
-            
-            # Calculate expansion ratio and ISP
-            throat_area = np.pi * (throat_diameter/2)**2
-            exit_area = np.pi * (exit_diameter/2)**2
-            expansion_ratio = exit_area / throat_area
-            
-            total_flow = fuel_flow_rate * (1 + mixture_ratio)
-            isp = steady_state['Thrust'] / (total_flow * 9.81)
-            
-            col2.metric("Expansion Ratio", f"{expansion_ratio:.2f}")
-            col2.metric("Specific Impulse", f"{isp:.2f} s")
-            
+        render_engine_simulation(simulator, simulation_time, (
+            mixture_ratio, 
+            chamber_pressure, 
+            chamber_temperature, 
+            chamber_volume, 
+            throat_diameter, 
+            exit_diameter, 
+            fuel_flow_rate
+        ))
+    
     with tab2:
         st.header("PID Control Simulation")
         
-        if st.button("Run PID Simulation", use_container_width=True):
-            # Create controller
-            if use_pinn_controller:
-                controller = PINNGuidedPIDController(
-                    pinn_model=model,
-                    kp=kp,
-                    ki=ki,
-                    kd=kd,
-                    setpoint=setpoint,
-                    output_limits=(0.05, 0.5)  # Fuel flow rate limits
-                )
-            else:
-                controller = PIDController(
-                    kp=kp,
-                    ki=ki,
-                    kd=kd,
-                    setpoint=setpoint,
-                    output_limits=(0.05, 0.5)  # Fuel flow rate limits
-                )
-            
-            # Run PID simulation
-            results = run_pid_simulation(
-                simulator,
-                controller,
-                setpoint,
-                control_variable,
-                simulation_time
-            )
-            
-            # Create plots
-            fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(10, 12))
-            
-            # Control variable (Thrust or Chamber Pressure)
-            if control_variable == "Thrust":
-                ax1.plot(results['Time'], results['Thrust'], 'b-', label='Actual')
-                ax1.axhline(y=setpoint, color='r', linestyle='--', label='Setpoint')
-                ax1.set_ylabel('Thrust [N]')
-            else:
-                ax1.plot(results['Time'], results['Chamber Pressure']/1e6, 'b-', label='Actual')
-                ax1.axhline(y=setpoint/1e6, color='r', linestyle='--', label='Setpoint')
-                ax1.set_ylabel('Chamber Pressure [MPa]')
-                
-            ax1.set_xlabel('Time [s]')
-            ax1.grid(True)
-            ax1.legend()
-            
-            # Control output (fuel flow rate)
-            ax2.plot(results['Time'], results['Fuel Flow Rate']*1000, 'g-')
-            ax2.set_ylabel('Fuel Flow Rate [g/s]')
-            ax2.set_xlabel('Time [s]')
-            ax2.grid(True)
-            
-            # Error
-            if control_variable == "Thrust":
-                error = setpoint - results['Thrust']
-            else:
-                error = setpoint - results['Chamber Pressure']
-                
-            ax3.plot(results['Time'], error, 'r-')
-            ax3.set_ylabel('Error')
-            ax3.set_xlabel('Time [s]')
-            ax3.grid(True)
-            
-            plt.tight_layout()
-            st.pyplot(fig)
-            
-            # Calculate performance metrics
-            settling_time = None
-            for i, err in enumerate(error):
-                if abs(err) < 0.05 * setpoint:
-                    settling_time = results['Time'][i]
-                    break
-                    
-            if settling_time:
-                st.metric("Settling Time", f"{settling_time:.2f} s")
-                
-            overshoot = 0
-            if control_variable == "Thrust":
-                max_val = np.max(results['Thrust'])
-                if max_val > setpoint:
-                    overshoot = (max_val - setpoint) / setpoint * 100
-            else:
-                max_val = np.max(results['Chamber Pressure'])
-                if max_val > setpoint:
-                    overshoot = (max_val - setpoint) / setpoint * 100
-                    
-            st.metric("Overshoot", f"{overshoot:.2f}%")
-            
-            # Steady-state error
-            if control_variable == "Thrust":
-                ss_error = np.mean(setpoint - results['Thrust'].iloc[-20:]) / setpoint * 100
-            else:
-                ss_error = np.mean(setpoint - results['Chamber Pressure'].iloc[-20:]) / setpoint * 100
-                
-            st.metric("Steady-State Error", f"{abs(ss_error):.2f}%")
+        render_pid_simulation(
+            model,
+            simulator,
+            control_variable,
+            setpoint,
+            (kp, ki, kd),
+            use_pinn_controller,
+            simulation_time
+        )
     
     with tab3:
         st.header("PINN Model Details")
@@ -561,92 +768,16 @@ def main():
         # Visualization of model prediction
         st.subheader("Parameter Sensitivity")
         
-        param_to_vary = st.selectbox(
-            "Parameter to Vary",
-            options=["Mixture Ratio", "Chamber Pressure", "Throat Diameter", "Exit Diameter", "Fuel Flow Rate"],
-            index=0
-        )
-        
-        # Create parameter variations
-        if param_to_vary == "Mixture Ratio":
-            values = np.linspace(1.5, 4.0, 6)
-            param_index = 0
-            param_name = "Mixture Ratio"
-            param_unit = ""
-        elif param_to_vary == "Chamber Pressure":
-            values = np.linspace(1.0e6, 5.0e6, 6)
-            param_index = 1
-            param_name = "Chamber Pressure"
-            param_unit = "MPa"
-            values_plot = values / 1e6  # Convert to MPa for plotting
-        elif param_to_vary == "Throat Diameter":
-            values = np.linspace(0.01, 0.05, 6)
-            param_index = 4
-            param_name = "Throat Diameter"
-            param_unit = "mm"
-            values_plot = values * 1000  # Convert to mm for plotting
-        elif param_to_vary == "Exit Diameter":
-            values = np.linspace(0.03, 0.15, 6)
-            param_index = 5
-            param_name = "Exit Diameter"
-            param_unit = "mm"
-            values_plot = values * 1000  # Convert to mm for plotting
-        else:  # Fuel Flow Rate
-            values = np.linspace(0.05, 0.5, 6)
-            param_index = 7
-            param_name = "Fuel Flow Rate"
-            param_unit = "g/s"
-            values_plot = values * 1000  # Convert to g/s for plotting
-            
-        # Run simulations with parameter variations
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 6))
-        
-        for i, val in enumerate(values):
-            # Create input array
-            inputs = np.zeros((1, 8))
-            inputs[0, 0] = mixture_ratio
-            inputs[0, 1] = chamber_pressure
-            inputs[0, 2] = chamber_temperature
-            inputs[0, 3] = chamber_volume
-            inputs[0, 4] = throat_diameter
-            inputs[0, 5] = exit_diameter
-            inputs[0, 6] = 0.0  # Time
-            inputs[0, 7] = fuel_flow_rate
-            
-            # Set varied parameter
-            inputs[0, param_index] = val
-            
-            # Convert to tensor
-            inputs_tensor = torch.tensor(inputs, dtype=torch.float32)
-            
-            # Get predictions
-            with torch.no_grad():
-                outputs = model(inputs_tensor).cpu().numpy()
-                
-            # Plot
-            if param_index == 0:
-                label_val = val
-            elif param_index == 1:
-                label_val = val / 1e6
-            elif param_index in (4, 5):
-                label_val = val * 1000
-            else:
-                label_val = val * 1000
-                
-            ax1.scatter(label_val, outputs[0, 2], label=f"{label_val:.2f}")  # Thrust
-            ax2.scatter(label_val, outputs[0, 1], label=f"{label_val:.2f}")  # Exit Velocity
-        
-        # Add axis labels
-        ax1.set_xlabel(f"{param_name} [{param_unit}]")
-        ax1.set_ylabel("Thrust [N]")
-        ax1.grid(True)
-        
-        ax2.set_xlabel(f"{param_name} [{param_unit}]")
-        ax2.set_ylabel("Exit Velocity [m/s]")
-        ax2.grid(True)
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+        render_parameter_sensitivity(model, (
+            mixture_ratio,
+            chamber_pressure,
+            chamber_temperature,
+            chamber_volume,
+            throat_diameter,
+            exit_diameter,
+            0.0,  # Time
+            fuel_flow_rate
+        ))
 
 
 if __name__ == "__main__":
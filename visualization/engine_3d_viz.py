@@ -1,7 +1,43 @@
+import os
+import shutil
+import hashlib
+import tempfile
+
 import plotly.graph_objects as go
 import numpy as np
 import pandas as pd
 
+# Directory for rendered HTML, keyed on figure builder and parameters
+VIZ_CACHE_DIR = '.viz_cache'
+
+
+def engine_radius_profile(z, chamber_length, nozzle_length, r_chamber, r_throat, r_exit):
+    """
+    Wall radius of the engine at each axial position.
+    
+    Constant radius in the chamber, then linear converging and diverging nozzle
+    sections with the throat 30% of the way along the nozzle. Evaluated for the
+    whole array at once with np.interp.
+    
+    Args:
+        z: Axial positions [m]
+        chamber_length: Length of combustion chamber [m]
+        nozzle_length: Length of nozzle [m]
+        r_chamber: Chamber radius [m]
+        r_throat: Throat radius [m]
+        r_exit: Nozzle exit radius [m]
+        
+    Returns:
+        Array of wall radii [m]
+    """
+    throat_position = chamber_length + nozzle_length * 0.3
+    
+    return np.interp(
+        z,
+        [0, chamber_length, throat_position, chamber_length + nozzle_length],
+        [r_chamber, r_chamber, r_throat, r_exit]
+    )
+
 
 def create_simplified_engine_3d(
     chamber_length=0.15,  # m
@@ -29,8 +65,8 @@ def create_simplified_engine_3d(
     Returns:
         Plotly figure with 3D engine model
     """
-    # Create figure
-    fig = go.Figure()
+    # Collect traces; the figure is built from all of them at once
+    traces = []
     
     # Generate points for chamber (cylinder)
     theta = np.linspace(0, 2*np.pi, num_points)
@@ -42,7 +78,7 @@ def create_simplified_engine_3d(
     y_chamber = r_chamber * np.sin(theta_grid)
     
     # Add combustion chamber
-    fig.add_trace(go.Surface(
+    traces.append(go.Surface(
         x=x_chamber,
         y=y_chamber,
         z=z_grid,
@@ -60,21 +96,8 @@ def create_simplified_engine_3d(
     r_throat = throat_diameter / 2
     r_exit = exit_diameter / 2
     
-    # Transition point from chamber to throat
-    throat_position = chamber_length + nozzle_length * 0.3
-    
     # Create radius profile along z-axis
-    r_nozzle = np.zeros_like(z_nozzle)
-    
-    for i, z in enumerate(z_nozzle):
-        if z < throat_position:
-            # Converging section (linear)
-            ratio = (z - chamber_length) / (throat_position - chamber_length)
-            r_nozzle[i] = r_chamber - ratio * (r_chamber - r_throat)
-        else:
-            # Diverging section (linear)
-            ratio = (z - throat_position) / (chamber_length + nozzle_length - throat_position)
-            r_nozzle[i] = r_throat + ratio * (r_exit - r_throat)
+    r_nozzle = engine_radius_profile(z_nozzle, chamber_length, nozzle_length, r_chamber, r_throat, r_exit)
     
     theta_grid, z_grid = np.meshgrid(theta, z_nozzle)
     r_grid, _ = np.meshgrid(r_nozzle, theta)
@@ -84,7 +107,7 @@ def create_simplified_engine_3d(
     y_nozzle = r_grid * np.sin(theta_grid)
     
     # Add nozzle
-    fig.add_trace(go.Surface(
+    traces.append(go.Surface(
         x=x_nozzle,
         y=y_nozzle,
         z=z_grid,
@@ -107,7 +130,7 @@ def create_simplified_engine_3d(
     x_injector = r_grid * np.cos(theta_grid)
     y_injector = r_grid * np.sin(theta_grid)
     
-    fig.add_trace(go.Surface(
+    traces.append(go.Surface(
         x=x_injector,
         y=y_injector,
         z=z_grid,
@@ -129,7 +152,7 @@ def create_simplified_engine_3d(
         y_channel = r_channel * np.sin(t)
         z_channel = np.linspace(0, chamber_length, 200)
         
-        fig.add_trace(go.Scatter3d(
+        traces.append(go.Scatter3d(
             x=x_channel,
             y=y_channel,
             z=z_channel,
@@ -142,7 +165,7 @@ def create_simplified_engine_3d(
         x_channel2 = r_channel * np.cos(t + np.pi)
         y_channel2 = r_channel * np.sin(t + np.pi)
         
-        fig.add_trace(go.Scatter3d(
+        traces.append(go.Scatter3d(
             x=x_channel2,
             y=y_channel2,
             z=z_channel,
@@ -170,7 +193,7 @@ def create_simplified_engine_3d(
         x_element_surface = x_element + element_radius * np.cos(theta_grid)
         y_element_surface = y_element + element_radius * np.sin(theta_grid)
         
-        fig.add_trace(go.Surface(
+        traces.append(go.Surface(
             x=x_element_surface,
             y=y_element_surface,
             z=z_grid,
@@ -194,7 +217,7 @@ def create_simplified_engine_3d(
     x_combustion = r_grid * np.cos(theta_grid)
     y_combustion = r_grid * np.sin(theta_grid)
     
-    fig.add_trace(go.Volume(
+    traces.append(go.Volume(
         x=x_combustion.flatten(),
         y=y_combustion.flatten(),
         z=z_grid.flatten(),
@@ -217,7 +240,7 @@ def create_simplified_engine_3d(
     x_exhaust = r_grid * np.cos(theta_grid)
     y_exhaust = r_grid * np.sin(theta_grid)
     
-    fig.add_trace(go.Volume(
+    traces.append(go.Volume(
         x=x_exhaust.flatten(),
         y=y_exhaust.flatten(),
         z=z_grid.flatten(),
@@ -227,6 +250,9 @@ def create_simplified_engine_3d(
         name="Exhaust Plume"
     ))
     
+    # Create figure (a single validation pass over all traces)
+    fig = go.Figure(data=traces)
+    
     # Set layout
     fig.update_layout(
         title="3D Rocket Engine Model",
@@ -283,73 +309,41 @@ def visualize_temperature_distribution(
     throat_position = chamber_length + nozzle_length * 0.3
     
     # Create radius profile for the engine
-    r_profile = np.zeros_like(z_total)
-    
-    for i, z in enumerate(z_total):
-        if z <= chamber_length:
-            # Chamber (constant radius)
-            r_profile[i] = r_chamber
-        elif z < throat_position:
-            # Converging section
-            ratio = (z - chamber_length) / (throat_position - chamber_length)
-            r_profile[i] = r_chamber - ratio * (r_chamber - r_throat)
-        else:
-            # Diverging section
-            ratio = (z - throat_position) / (chamber_length + nozzle_length - throat_position)
-            r_profile[i] = r_throat + ratio * (r_exit - r_throat)
+    r_profile = engine_radius_profile(z_total, chamber_length, nozzle_length, r_chamber, r_throat, r_exit)
     
     # Create a temperature distribution model
     # Peak temperature near the injector, then gradual decrease
-    temp_distribution = np.zeros((num_points, num_points))
-    
     # Radial positions
     r_positions = np.linspace(0, 1, num_points)  # Normalized radius
     
-    for i, z in enumerate(z_total):
-        for j, r_norm in enumerate(r_positions):
-            # Actual radius at this position
-            r_actual = r_norm * r_profile[i]
-            
-            # Base temperature profile along axis
-            if z < chamber_length * 0.3:
-                # Temperature rises in the first third of the chamber
-                z_factor = z / (chamber_length * 0.3)
-                base_temp = ambient_temp + z_factor * (max_temp - ambient_temp)
-            elif z < throat_position:
-                # Temperature is high in the chamber, then starts dropping toward throat
-                z_factor = (z - chamber_length * 0.3) / (throat_position - chamber_length * 0.3)
-                base_temp = max_temp - z_factor * (max_temp - max_temp * 0.7)
-            else:
-                # Temperature drops more rapidly in the diverging section
-                z_factor = (z - throat_position) / (chamber_length + nozzle_length - throat_position)
-                base_temp = max_temp * 0.7 - z_factor * (max_temp * 0.7 - ambient_temp)
-            
-            # Radial temperature variation (hotter in the core, cooler near walls)
-            # Use quadratic profile: T = T_base * (1 - r_norm^2)
-            radial_factor = 1 - 0.5 * r_norm**2
-            
-            # Combine factors
-            temp_distribution[i, j] = base_temp * radial_factor
+    # Base temperature profile along axis (piecewise linear):
+    # rises over the first third of the chamber, drops to 70% at the throat,
+    # then falls to ambient at the exit
+    base_temp = np.interp(
+        z_total,
+        [0, chamber_length * 0.3, throat_position, chamber_length + nozzle_length],
+        [ambient_temp, max_temp, max_temp * 0.7, ambient_temp]
+    )
+    
+    # Radial temperature variation (hotter in the core, cooler near walls)
+    # Use quadratic profile: T = T_base * (1 - 0.5 * r_norm^2)
+    radial_factor = 1 - 0.5 * r_positions**2
+    
+    # Combine factors: [axial, radial] grid in one broadcast
+    temp_distribution = np.outer(base_temp, radial_factor)
     
     # Create cylindrical grid
     theta = np.linspace(0, 2*np.pi, 36)
     z_grid, r_norm_grid = np.meshgrid(z_total, r_positions)
     r_grid = r_norm_grid * np.reshape(r_profile, (1, -1))
     
-    # Convert to Cartesian coordinates
-    x = np.zeros((num_points, num_points, len(theta)))
-    y = np.zeros((num_points, num_points, len(theta)))
-    z = np.zeros((num_points, num_points, len(theta)))
-    
-    for k, angle in enumerate(theta):
-        x[:, :, k] = r_grid * np.cos(angle)
-        y[:, :, k] = r_grid * np.sin(angle)
-        z[:, :, k] = z_grid
+    # Convert to Cartesian coordinates, broadcasting over the angle axis
+    x = r_grid[:, :, np.newaxis] * np.cos(theta)
+    y = r_grid[:, :, np.newaxis] * np.sin(theta)
+    z = np.broadcast_to(z_grid[:, :, np.newaxis], x.shape)
     
     # Create temperature array matching the 3D coordinates
-    temp_3d = np.zeros((num_points, num_points, len(theta)))
-    for k in range(len(theta)):
-        temp_3d[:, :, k] = temp_distribution.T
+    temp_3d = np.broadcast_to(temp_distribution.T[:, :, np.newaxis], x.shape)
     
     # Create 3D volume plot
     fig.add_trace(go.Volume(
@@ -445,20 +439,7 @@ def visualize_flow_velocity(
     throat_position = chamber_length + nozzle_length * 0.3
     
     # Create radius profile for the engine
-    r_profile = np.zeros_like(z_total)
-    
-    for i, z in enumerate(z_total):
-        if z <= chamber_length:
-            # Chamber (constant radius)
-            r_profile[i] = r_chamber
-        elif z < throat_position:
-            # Converging section
-            ratio = (z - chamber_length) / (throat_position - chamber_length)
-            r_profile[i] = r_chamber - ratio * (r_chamber - r_throat)
-        else:
-            # Diverging section
-            ratio = (z - throat_position) / (chamber_length + nozzle_length - throat_position)
-            r_profile[i] = r_throat + ratio * (r_exit - r_throat)
+    r_profile = engine_radius_profile(z_total, chamber_length, nozzle_length, r_chamber, r_throat, r_exit)
     
     # Calculate areas at each position
     areas = np.pi * r_profile**2
@@ -470,26 +451,24 @@ def visualize_flow_velocity(
     
     # Adjust velocity profile to be physical:
     # Low at injector, increases toward throat, then slightly decreases in diverging section
-    axial_velocity = np.zeros_like(normalized_velocity)
-    
-    for i, z in enumerate(z_total):
-        if z < chamber_length * 0.1:
+    injector_end = chamber_length * 0.1
+    axial_velocity = np.select(
+        [
             # Near injector face, velocity is low but increasing
-            factor = z / (chamber_length * 0.1)
-            axial_velocity[i] = 0.1 * max_velocity * factor
-        elif z < chamber_length:
+            z_total < injector_end,
             # In the chamber, velocity increases gradually
-            factor = (z - chamber_length * 0.1) / (chamber_length - chamber_length * 0.1)
-            axial_velocity[i] = 0.1 * max_velocity + factor * (0.3 * max_velocity - 0.1 * max_velocity)
-        elif z < throat_position:
+            z_total < chamber_length,
             # In the converging section, velocity increases rapidly
-            factor = (z - chamber_length) / (throat_position - chamber_length)
-            axial_velocity[i] = 0.3 * max_velocity + factor * (max_velocity - 0.3 * max_velocity)
-        else:
-            # In the diverging section, velocity increases but less rapidly
-            factor = (z - throat_position) / (chamber_length + nozzle_length - throat_position)
-            # Use a more realistic expansion model
-            axial_velocity[i] = max_velocity * (1 + 0.5 * factor)
+            z_total < throat_position
+        ],
+        [
+            0.1 * max_velocity * z_total / injector_end,
+            0.1 * max_velocity + (z_total - injector_end) / (chamber_length - injector_end) * (0.3 * max_velocity - 0.1 * max_velocity),
+            0.3 * max_velocity + (z_total - chamber_length) / (throat_position - chamber_length) * (max_velocity - 0.3 * max_velocity)
+        ],
+        # In the diverging section, velocity increases but less rapidly
+        default=max_velocity * (1 + 0.5 * (z_total - throat_position) / (chamber_length + nozzle_length - throat_position))
+    )
     
     # Create velocity vectors for visualization
     # We'll create a grid of points and vectors
@@ -500,66 +479,39 @@ def visualize_flow_velocity(
     # Angular positions
     theta_positions = np.linspace(0, 2*np.pi, 8, endpoint=False)  # 8 angular positions
     
-    # Create lists to store vector positions and components
-    x, y, z = [], [], []
-    u, v, w = [], [], []
-    
-    # Create vectors at various positions
-    for i, z_pos in enumerate(z_total):
-        # Area at this position
-        area = areas[i]
-        
-        # Velocity at this position
-        vel = axial_velocity[i]
-        
-        # Current radius in profile
-        r_current = r_profile[i]
-        
-        for r_norm in r_positions:
-            r_actual = r_norm * r_current
-            
-            for theta in theta_positions:
-                # Vector start position (Cartesian)
-                x_pos = r_actual * np.cos(theta)
-                y_pos = r_actual * np.sin(theta)
-                
-                # Add to position lists
-                x.append(x_pos)
-                y.append(y_pos)
-                z.append(z_pos)
-                
-                # Vector components (mainly axial with small radial component)
-                # Add a small radial component in the converging/diverging sections
-                u_component, v_component, w_component = 0, 0, vel
-                
-                if z_pos > chamber_length and z_pos < throat_position:
-                    # Converging section - add inward radial component
-                    radial_component = -0.2 * vel
-                    u_component = radial_component * np.cos(theta)
-                    v_component = radial_component * np.sin(theta)
-                elif z_pos > throat_position:
-                    # Diverging section - add outward radial component
-                    radial_component = 0.1 * vel
-                    u_component = radial_component * np.cos(theta)
-                    v_component = radial_component * np.sin(theta)
-                
-                # Add to vector component lists
-                u.append(u_component)
-                v.append(v_component)
-                w.append(w_component)
+    # Vector grid over (axial, radial, angular) positions, flattened in that order
+    cos_theta = np.cos(theta_positions)
+    sin_theta = np.sin(theta_positions)
+    r_actual = np.outer(r_profile, r_positions)[:, :, np.newaxis]
+    grid_shape = (len(z_total), len(r_positions), len(theta_positions))
+    
+    # Vector start positions (Cartesian)
+    x = (r_actual * cos_theta).ravel()
+    y = (r_actual * sin_theta).ravel()
+    z = np.broadcast_to(z_total[:, np.newaxis, np.newaxis], grid_shape).ravel()
+    
+    # Vector components (mainly axial with small radial component)
+    # Converging section: inward radial component; diverging section: outward
+    radial_fraction = np.select(
+        [(z_total > chamber_length) & (z_total < throat_position), z_total > throat_position],
+        [-0.2, 0.1],
+        default=0.0
+    )
+    radial_component = (radial_fraction * axial_velocity)[:, np.newaxis, np.newaxis]
+    u = np.broadcast_to(radial_component * cos_theta, grid_shape).ravel()
+    v = np.broadcast_to(radial_component * sin_theta, grid_shape).ravel()
+    w = np.broadcast_to(axial_velocity[:, np.newaxis, np.newaxis], grid_shape).ravel()
     
     # Normalize vectors for visualization
-    vectors = np.array([u, v, w]).T
-    vector_lengths = np.linalg.norm(vectors, axis=1)
-    max_length = np.max(vector_lengths)
+    max_length = np.sqrt(np.max(u**2 + v**2 + w**2))
     
     # Scale factors for visualization
     scale_factor = chamber_length / (10 * max_length)
     
     # Scale vectors for visualization
-    u = np.array(u) * scale_factor
-    v = np.array(v) * scale_factor
-    w = np.array(w) * scale_factor
+    u = u * scale_factor
+    v = v * scale_factor
+    w = w * scale_factor
     
     # Add vectors to plot
     fig.add_trace(go.Cone(
@@ -614,13 +566,50 @@ def visualize_flow_velocity(
     return fig
 
 
+def write_html_cached(build_figure, output_file, cache_dir=VIZ_CACHE_DIR, **params):
+    """
+    Write a figure's HTML, reusing a previous rendering with the same parameters.
+    
+    The rendered HTML is stored under cache_dir, keyed on the builder name, its
+    parameters and this module's modification time (so edits invalidate it).
+    A repeat call is then a file copy instead of a figure build + serialization.
+    
+    Args:
+        build_figure: Figure builder, e.g. create_simplified_engine_3d
+        output_file: Path of the HTML file to write
+        cache_dir: Directory holding cached renderings
+        **params: Keyword arguments for build_figure
+        
+    Returns:
+        Path of the written HTML file
+    """
+    key_source = repr((build_figure.__name__, sorted(params.items()), os.path.getmtime(__file__)))
+    key = hashlib.blake2b(key_source.encode(), digest_size=12).hexdigest()
+    cached_file = os.path.join(cache_dir, f"{key}.html")
+    
+    if not os.path.exists(cached_file):
+        os.makedirs(cache_dir, exist_ok=True)
+        
+        # Write to a temporary file and move it into place atomically, so an
+        # interrupted write never leaves a truncated file at the cache path
+        fd, tmp_file = tempfile.mkstemp(suffix='.html.tmp', dir=cache_dir)
+        os.close(fd)
+        try:
+            build_figure(**params).write_html(tmp_file)
+            os.replace(tmp_file, cached_file)
+        except BaseException:
+            os.remove(tmp_file)
+            raise
+        
+    shutil.copyfile(cached_file, output_file)
+    
+    return output_file
+
+
 if __name__ == "__main__":
     # Example usage
-    fig_engine = create_simplified_engine_3d()
-    fig_engine.write_html("rocket_engine_3d.html")
+    write_html_cached(create_simplified_engine_3d, "rocket_engine_3d.html")
     
-    fig_temp = visualize_temperature_distribution()
-    fig_temp.write_html("temperature_distribution.html")
+    write_html_cached(visualize_temperature_distribution, "temperature_distribution.html")
     
-    fig_flow = visualize_flow_velocity()
-    fig_flow.write_html("flow_velocity.html") 
\ No newline at end of file
+    write_html_cached(visualize_flow_velocity, "flow_velocity.html") 
\ No newline at end of file